@@ -0,0 +1,340 @@
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+
+# Streaming statistics behind thesis_analysis.py and verify_trade_offs.py,
+# which import the primitives, the column names and the thresholds from here,
+# and an out-of-core command line for inputs too large for memory. Files are
+# read in chunks and only fixed-size accumulators are kept: running co-moments
+# for means and correlations, P-square estimators for medians,
+# StandardScaler/MiniBatchKMeans partial fits for the clusters. Works on
+# evaluation histories (one row per replicate) as well as on Pareto front files.
+#
+# Usage: python3 analysis/streaming_analytics.py <csv ...> [--ticks 300] [--chunksize 100000]
+
+PARAM_NAMES = {
+    'bridging-capital-weight': 'Bridging',
+    'innovation-diffusion-rate': 'Innov_Diff',
+    'policy-effectiveness': 'Policy',
+    'cultural-diffusion-rate': 'Cultural_Diff'
+}
+PARAM_COLS = list(PARAM_NAMES.values())
+OBJ_COLS = ['Innovation', 'Diversity', 'Gini']
+N_CLUSTERS = 4
+# Upper Gini of the "middle ground" between innovation and equity
+GINI_THRESHOLD = 0.11
+# Cluster archetypes, tested in this order on the cluster means
+EQUITABLE_GINI = 0.113
+HUB_INNOVATION = 480000
+DIVERSE_DIVERSITY = 0.61
+CHUNKSIZE = 100000
+BATCH_SIZE = 1024
+KMEANS_EPOCHS = 20
+KMEANS_TOL = 1e-4
+CORRELATIONS_FILE = "streaming_correlations.csv"
+CLUSTERS_FILE = "streaming_clusters.csv"
+
+
+# --- STREAMING PRIMITIVES ---
+class RunningMoments:
+    """Count, mean, min/max and co-moment matrix of a stream of row blocks.
+
+    Blocks are merged with the pairwise update of Chan et al., so the result
+    does not depend on how the stream is chunked.
+    """
+    def __init__(self, columns):
+        self.columns = list(columns)
+        d = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(d)
+        self.m2 = np.zeros((d, d))
+        self.min = np.full(d, np.inf)
+        self.max = np.full(d, -np.inf)
+
+    def update(self, X):
+        X = np.asarray(X, dtype=float)
+        n_b = len(X)
+        if n_b == 0:
+            return
+        mean_b = X.mean(axis=0)
+        centred = X - mean_b
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.m2 += centred.T @ centred + np.outer(delta, delta) * (self.n * n_b / n)
+        self.mean += delta * (n_b / n)
+        self.n = n
+        self.min = np.minimum(self.min, X.min(axis=0))
+        self.max = np.maximum(self.max, X.max(axis=0))
+
+    def covariance(self):
+        return self.m2 / max(self.n - 1, 1)
+
+    def std(self):
+        return np.sqrt(np.diag(self.covariance()))
+
+    def correlation(self):
+        scale = np.sqrt(np.diag(self.m2))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.m2 / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class P2Quantile:
+    """P-square streaming quantile (Jain & Chlamtac 1985): five markers, O(1) memory."""
+    def __init__(self, p):
+        self.p = p
+        self.q = []
+        self.pos = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.step = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, values):
+        q, pos, desired, step = self.q, self.pos, self.desired, self.step
+        for x in np.asarray(values, dtype=float).tolist():
+            if len(q) < 5:
+                q.append(x)
+                q.sort()
+                continue
+            if x < q[0]:
+                q[0] = x
+                k = 0
+            elif x >= q[4]:
+                q[4] = x
+                k = 3
+            else:
+                k = 0
+                while x >= q[k + 1]:
+                    k += 1
+            for i in range(k + 1, 5):
+                pos[i] += 1
+            for i in range(5):
+                desired[i] += step[i]
+            for i in (1, 2, 3):
+                d = desired[i] - pos[i]
+                if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                    d = 1 if d > 0 else -1
+                    # Piecewise-parabolic prediction, linear when it leaves the bracket
+                    qp = q[i] + d / (pos[i + 1] - pos[i - 1]) * (
+                        (pos[i] - pos[i - 1] + d) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                        + (pos[i + 1] - pos[i] - d) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1]))
+                    if not q[i - 1] < qp < q[i + 1]:
+                        qp = q[i] + d * (q[i + d] - q[i]) / (pos[i + d] - pos[i])
+                    q[i] = qp
+                    pos[i] += d
+
+    def value(self):
+        if len(self.q) < 5:
+            return float(np.percentile(self.q, self.p * 100)) if self.q else np.nan
+        return self.q[2]
+
+
+class RunningExtreme:
+    """Row with the largest (or smallest) value of one column seen so far."""
+    def __init__(self, column, largest=True):
+        self.column = column
+        self.largest = largest
+        self.row = None
+
+    def update(self, chunk):
+        if len(chunk) == 0:
+            return
+        idx = chunk[self.column].idxmax() if self.largest else chunk[self.column].idxmin()
+        best = chunk.loc[idx]
+        if self.row is None:
+            self.row = best
+        elif best[self.column] > self.row[self.column] if self.largest else best[self.column] < self.row[self.column]:
+            self.row = best
+
+
+def cluster_name(innovation, diversity, gini):
+    """Archetype of a cluster from its mean objectives."""
+    if gini < EQUITABLE_GINI:
+        return "🟢 Equitable City"
+    if innovation > HUB_INNOVATION:
+        return "🔴 Innovation Hub"
+    if diversity > DIVERSE_DIVERSITY:
+        return "🟡 Diverse Metropolis"
+    return "🔵 Balanced City"
+
+
+# --- INPUT ---
+def read_chunks(paths, chunksize=CHUNKSIZE, ticks=None):
+    """Parameters and objectives of every row, one DataFrame of at most `chunksize` rows at a time."""
+    for path in paths:
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            if ticks is not None and 'Ticks' in chunk.columns:
+                chunk = chunk[chunk['Ticks'] == ticks]
+            if 'Obj_Innov_Neg' in chunk.columns:
+                chunk = chunk.assign(Innovation=-chunk['Obj_Innov_Neg'], Diversity=-chunk['Obj_Div_Neg'],
+                                     Gini=chunk['Obj_Gini'])
+            else:
+                chunk = chunk.rename(columns={'innovation': 'Innovation', 'diversity': 'Diversity',
+                                              'gini': 'Gini'})
+            chunk = chunk.rename(columns=PARAM_NAMES)[PARAM_COLS + OBJ_COLS].dropna()
+            if len(chunk):
+                yield chunk
+
+
+# --- ANALYSES ---
+def trade_off_statistics(chunks):
+    """One pass: correlations, extremes, objective medians and the Gini <= GINI_THRESHOLD middle ground."""
+    stats = {
+        "all": RunningMoments(PARAM_COLS + OBJ_COLS),
+        "middle": RunningMoments(PARAM_COLS + OBJ_COLS),
+        "median": {c: P2Quantile(0.5) for c in OBJ_COLS},
+        "middle_median": {c: P2Quantile(0.5) for c in PARAM_COLS},
+        "max_innovation": RunningExtreme('Innovation'),
+        "max_diversity": RunningExtreme('Diversity'),
+        "min_gini": RunningExtreme('Gini', largest=False),
+    }
+    scaler = StandardScaler()
+    for chunk in chunks:
+        stats["all"].update(chunk.to_numpy())
+        for c in OBJ_COLS:
+            stats["median"][c].update(chunk[c].to_numpy())
+        middle = chunk[chunk['Gini'] <= GINI_THRESHOLD]
+        stats["middle"].update(middle.to_numpy())
+        for c in PARAM_COLS:
+            stats["middle_median"][c].update(middle[c].to_numpy())
+        for key in ["max_innovation", "max_diversity", "min_gini"]:
+            stats[key].update(chunk)
+        scaler.partial_fit(chunk[OBJ_COLS])
+    stats["scaler"] = scaler
+    return stats
+
+
+def fit_clusters(chunks, scaler, seed=42, epochs=KMEANS_EPOCHS):
+    """Mini-batch k-means on the standardized objectives.
+
+    `chunks` returns a fresh chunk iterator; every epoch streams the input
+    once in batches of BATCH_SIZE rows, until no centre moves by more than
+    KMEANS_TOL over an epoch.
+    """
+    kmeans = MiniBatchKMeans(n_clusters=N_CLUSTERS, random_state=seed, n_init=10, batch_size=BATCH_SIZE)
+    pending = np.empty((0, len(OBJ_COLS)))
+    for _ in range(epochs):
+        before = kmeans.cluster_centers_.copy() if hasattr(kmeans, "cluster_centers_") else None
+        for chunk in chunks():
+            X = scaler.transform(chunk[OBJ_COLS])
+            if not hasattr(kmeans, "cluster_centers_"):
+                # The first batch initializes the centres and needs a row per cluster
+                pending = np.vstack([pending, X])
+                if len(pending) < N_CLUSTERS:
+                    continue
+                X = pending
+            for start in range(0, len(X), BATCH_SIZE):
+                kmeans.partial_fit(X[start:start + BATCH_SIZE])
+        if before is not None and np.abs(kmeans.cluster_centers_ - before).max() < KMEANS_TOL:
+            break
+    return kmeans
+
+
+def cluster_profiles(chunks, scaler, kmeans):
+    """Per-cluster means of parameters and objectives, named by cluster_name()."""
+    moments = [RunningMoments(PARAM_COLS + OBJ_COLS) for _ in range(N_CLUSTERS)]
+    for chunk in chunks:
+        labels = kmeans.predict(scaler.transform(chunk[OBJ_COLS]))
+        values = chunk.to_numpy()
+        for k in range(N_CLUSTERS):
+            moments[k].update(values[labels == k])
+
+    profiles = []
+    for k, m in enumerate(moments):
+        means = dict(zip(m.columns, m.mean))
+        name = cluster_name(means['Innovation'], means['Diversity'], means['Gini']) if m.n else "(empty)"
+        profiles.append({"Cluster": k, "Name": name, "Count": m.n, **means})
+    return pd.DataFrame(profiles).sort_values("Innovation", ascending=False)
+
+
+def print_extreme(title, row):
+    print(f"\n📍 {title}:")
+    print(f"   Innovation: {row['Innovation']:>12,.0f}   Diversity: {row['Diversity']:.3f}   Gini: {row['Gini']:.3f}")
+    print("   " + ", ".join(f"{p} {row[p]:.3f}" for p in PARAM_COLS))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {"--ticks": None, "--chunksize": CHUNKSIZE}
+    for flag in options:
+        if flag in args:
+            k = args.index(flag)
+            options[flag] = int(args[k + 1])
+            args = args[:k] + args[k + 2:]
+    if not args:
+        print("Usage: python3 analysis/streaming_analytics.py <csv ...> [--ticks 300] [--chunksize 100000]")
+        sys.exit(1)
+
+    def chunks():
+        return read_chunks(args, options["--chunksize"], options["--ticks"])
+
+    print("=" * 70)
+    print("📊 STREAMING TRADE-OFF AND CLUSTER ANALYSIS")
+    print("=" * 70)
+
+    stats = trade_off_statistics(chunks())
+    moments, middle = stats["all"], stats["middle"]
+    if moments.n == 0:
+        print("❌ No rows to analyse")
+        sys.exit(1)
+    print(f"\n✅ Rows analysed: {moments.n:,} (chunks of {options['--chunksize']:,})")
+
+    print("\n" + "=" * 70)
+    print("OBJECTIVE RANGES")
+    print("=" * 70)
+    for c in OBJ_COLS:
+        i = moments.columns.index(c)
+        print(f"{c:12s}: {moments.min[i]:>12.3f} - {moments.max[i]:>12.3f}   mean {moments.mean[i]:>12.3f}   "
+              f"median ≈ {stats['median'][c].value():>12.3f}")
+
+    print_extreme("Max Innovation", stats["max_innovation"].row)
+    print_extreme("Max Diversity", stats["max_diversity"].row)
+    print_extreme("Min Gini (Max Equity)", stats["min_gini"].row)
+
+    print("\n" + "=" * 70)
+    print("CORRELATIONS")
+    print("=" * 70)
+    corr = moments.correlation()
+    corr.to_csv(CORRELATIONS_FILE)
+    print(f"\nCorrelation Innovation-Diversity: {corr.loc['Innovation', 'Diversity']:.3f}")
+    for obj in OBJ_COLS:
+        print(f"\n{obj}:")
+        for p in PARAM_COLS:
+            r = corr.loc[p, obj]
+            strength = "Strong" if abs(r) > 0.5 else "Moderate" if abs(r) > 0.3 else "Weak"
+            print(f"   {p:15s}: {r:>+.3f} ({strength})")
+
+    print("\n" + "=" * 70)
+    print(f"MIDDLE GROUND (Gini <= {GINI_THRESHOLD})")
+    print("=" * 70)
+    if middle.n > 0:
+        innov = moments.columns.index('Innovation')
+        print(f"\nRows: {middle.n:,} of {moments.n:,}")
+        print(f"Max innovation: {middle.max[innov]:,.0f} "
+              f"({middle.max[innov] / moments.max[innov] * 100:.1f}% of the global max {moments.max[innov]:,.0f})")
+        for p in PARAM_COLS:
+            i = middle.columns.index(p)
+            print(f"   {p:15s}: {middle.min[i]:.3f} - {middle.max[i]:.3f}   mean {middle.mean[i]:.3f}   "
+                  f"median ≈ {stats['middle_median'][p].value():.3f}")
+    else:
+        print(f"\n❌ No rows with Gini <= {GINI_THRESHOLD}")
+
+    print("\n" + "=" * 70)
+    print(f"🔍 CLUSTERING ANALYSIS (Mini-batch K-Means, k={N_CLUSTERS})")
+    print("=" * 70)
+    if moments.n < N_CLUSTERS:
+        print("\n❌ Fewer rows than clusters")
+        sys.exit(1)
+    kmeans = fit_clusters(chunks, stats["scaler"])
+    profiles = cluster_profiles(chunks(), stats["scaler"], kmeans)
+    profiles.to_csv(CLUSTERS_FILE, index=False)
+    for _, profile in profiles.iterrows():
+        print(f"\n{profile['Name']} (Cluster {profile['Cluster']}, n={profile['Count']:,}):")
+        print(f"   Avg Innovation: {profile['Innovation']:>12,.0f}")
+        print(f"   Avg Diversity:  {profile['Diversity']:>12.3f}")
+        print(f"   Avg Gini:       {profile['Gini']:>12.3f}")
+        print("   Typical Parameters: " + ", ".join(f"{p} {profile[p]:.3f}" for p in PARAM_COLS))
+
+    print(f"\n✅ Saved: {CORRELATIONS_FILE}, {CLUSTERS_FILE}")
@@ -3,7 +3,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+
+from streaming_analytics import (N_CLUSTERS, OBJ_COLS, PARAM_COLS, PARAM_NAMES, cluster_profiles,
+                                 trade_off_statistics)
 
 # ========== CARICA DATI ==========
 print("="*70)
@@ -18,31 +20,32 @@ df['Diversity'] = -df['Obj_Div_Neg']
 df['Gini'] = df['Obj_Gini']
 
 # Abbrevia nomi parametri per leggibilità
-df = df.rename(columns={
-    'bridging-capital-weight': 'Bridging',
-    'innovation-diffusion-rate': 'Innov_Diff',
-    'policy-effectiveness': 'Policy',
-    'cultural-diffusion-rate': 'Cultural_Diff'
-})
+df = df.rename(columns=PARAM_NAMES)
+
+param_cols = PARAM_COLS
+obj_cols = OBJ_COLS
 
-param_cols = ['Bridging', 'Innov_Diff', 'Policy', 'Cultural_Diff']
-obj_cols = ['Innovation', 'Diversity', 'Gini']
+# Statistiche in un passaggio, con gli stessi accumulatori di streaming_analytics.py
+stats = trade_off_statistics([df[param_cols + obj_cols]])
+moments = stats["all"]
+lo = dict(zip(moments.columns, moments.min))
+hi = dict(zip(moments.columns, moments.max))
 
 # ========== STATISTICHE BASE ==========
-print(f"\n✅ Number of Pareto-optimal solutions: {len(df)}")
+print(f"\n✅ Number of Pareto-optimal solutions: {moments.n}")
 print("\n" + "="*70)
 print("OBJECTIVE RANGES")
 print("="*70)
 
 for obj in obj_cols:
-    print(f"{obj:12s}: {df[obj].min():>10.2f} - {df[obj].max():>10.2f}  (range: {df[obj].max()-df[obj].min():>10.2f})")
+    print(f"{obj:12s}: {lo[obj]:>10.2f} - {hi[obj]:>10.2f}  (range: {hi[obj]-lo[obj]:>10.2f})")
 
 print("\n" + "="*70)
 print("PARAMETER RANGES")
 print("="*70)
 
 for param in param_cols:
-    print(f"{param:15s}: {df[param].min():.3f} - {df[param].max():.3f}")
+    print(f"{param:15s}: {lo[param]:.3f} - {hi[param]:.3f}")
 
 # ========== IDENTIFICA SOLUZIONI ESTREME ==========
 print("\n" + "="*70)
@@ -50,9 +53,9 @@ print("🎯 EXTREME SOLUTIONS (Archetypes)")
 print("="*70)
 
 extremes = {
-    'Max Innovation': df.loc[df['Innovation'].idxmax()],
-    'Max Diversity': df.loc[df['Diversity'].idxmax()],
-    'Min Gini (Max Equity)': df.loc[df['Gini'].idxmin()]
+    'Max Innovation': stats["max_innovation"].row,
+    'Max Diversity': stats["max_diversity"].row,
+    'Min Gini (Max Equity)': stats["min_gini"].row
 }
 
 for name, sol in extremes.items():
@@ -67,67 +70,40 @@ for name, sol in extremes.items():
 
 # ========== CLUSTERING ==========
 print("\n" + "="*70)
-print("🔍 CLUSTERING ANALYSIS (K-Means, k=4)")
+print(f"🔍 CLUSTERING ANALYSIS (K-Means, k={N_CLUSTERS})")
 print("="*70)
 
-# Standardizza e clusterizza
-scaler = StandardScaler()
-X = scaler.fit_transform(df[obj_cols])
-kmeans = KMeans(n_clusters=4, random_state=42, n_init=10)
+# Standardizza (scaler del passaggio statistico) e clusterizza
+scaler = stats["scaler"]
+X = scaler.transform(df[obj_cols])
+kmeans = KMeans(n_clusters=N_CLUSTERS, random_state=42, n_init=10)
 df['Cluster'] = kmeans.fit_predict(X)
 
-# Assegna nomi basati su caratteristiche
-cluster_profiles = []
-for cluster_id in range(4):
-    cluster_df = df[df['Cluster'] == cluster_id]
-    avg_innov = cluster_df['Innovation'].mean()
-    avg_div = cluster_df['Diversity'].mean()
-    avg_gini = cluster_df['Gini'].mean()
-    
-    # Logica di naming
-    if avg_gini < 0.113:
-        name = "🟢 Equitable City"
-    elif avg_innov > 480000:
-        name = "🔴 Innovation Hub"
-    elif avg_div > 0.61:
-        name = "🟡 Diverse Metropolis"
-    else:
-        name = "🔵 Balanced City"
-    
-    cluster_profiles.append({
-        'id': cluster_id,
-        'name': name,
-        'count': len(cluster_df),
-        'innov': avg_innov,
-        'div': avg_div,
-        'gini': avg_gini
-    })
-
-# Ordina per innovazione decrescente
-cluster_profiles.sort(key=lambda x: x['innov'], reverse=True)
-
-for profile in cluster_profiles:
-    print(f"\n{profile['name']} (Cluster {profile['id']}, n={profile['count']}):")
-    print(f"   Avg Innovation: {profile['innov']:>10.0f}")
-    print(f"   Avg Diversity:  {profile['div']:>10.3f}")
-    print(f"   Avg Gini:       {profile['gini']:>10.3f}")
+# Medie e nomi dei cluster, ordinati per innovazione decrescente
+profiles = cluster_profiles([df[param_cols + obj_cols]], scaler, kmeans)
+names = dict(zip(profiles['Cluster'], profiles['Name']))
+
+for _, profile in profiles.iterrows():
+    print(f"\n{profile['Name']} (Cluster {profile['Cluster']}, n={profile['Count']}):")
+    print(f"   Avg Innovation: {profile['Innovation']:>10.0f}")
+    print(f"   Avg Diversity:  {profile['Diversity']:>10.3f}")
+    print(f"   Avg Gini:       {profile['Gini']:>10.3f}")
     
     # Parametri tipici
-    cluster_df = df[df['Cluster'] == profile['id']]
     print(f"   Typical Parameters:")
     for param in param_cols:
-        print(f"     {param:15s}: {cluster_df[param].mean():.3f}")
+        print(f"     {param:15s}: {profile[param]:.3f}")
 
 # ========== TRADE-OFF ANALYSIS ==========
 print("\n" + "="*70)
 print("⚖️ TRADE-OFF QUANTIFICATION")
 print("="*70)
 
-max_innov = df['Innovation'].max()
-max_innov_sol = df.loc[df['Innovation'].idxmax()]
+max_innov_sol = stats["max_innovation"].row
+max_innov = max_innov_sol['Innovation']
 
-min_gini = df['Gini'].min()
-min_gini_sol = df.loc[df['Gini'].idxmin()]
+min_gini_sol = stats["min_gini"].row
+min_gini = min_gini_sol['Gini']
 
 equity_cost_abs = max_innov - min_gini_sol['Innovation']
 equity_cost_pct = (equity_cost_abs / max_innov) * 100
@@ -142,8 +118,8 @@ print(f"   Interpretation: Reducing inequality from {max_innov_sol['Gini']:.3f}"
 print(f"   to {min_gini:.3f} costs {equity_cost_pct:.1f}% of innovation output.")
 
 # Diversità
-max_div = df['Diversity'].max()
-max_div_sol = df.loc[df['Diversity'].idxmax()]
+max_div_sol = stats["max_diversity"].row
+max_div = max_div_sol['Diversity']
 
 div_tradeoff = max_innov - max_div_sol['Innovation']
 div_tradeoff_pct = (div_tradeoff / max_innov) * 100
@@ -161,7 +137,7 @@ print("\n" + "="*70)
 print("📈 PARAMETER-OBJECTIVE CORRELATIONS")
 print("="*70)
 
-corr_matrix = df[param_cols + obj_cols].corr()
+corr_matrix = moments.correlation()
 
 print("\nCorrelation with Innovation:")
 for param in param_cols:
@@ -194,11 +170,10 @@ fig = plt.figure(figsize=(18, 6))
 
 # Subplot 1: Innovation vs Gini
 ax1 = fig.add_subplot(131)
-for cluster_id in range(4):
+for cluster_id in range(N_CLUSTERS):
     cluster_df = df[df['Cluster'] == cluster_id]
-    profile = [p for p in cluster_profiles if p['id'] == cluster_id][0]
     ax1.scatter(cluster_df['Innovation']/1000, cluster_df['Gini'], 
-                label=profile['name'], s=120, alpha=0.7)
+                label=names[cluster_id], s=120, alpha=0.7)
 ax1.set_xlabel('Innovation (×1000)', fontsize=12, fontweight='bold')
 ax1.set_ylabel('Gini Coefficient\n(lower = more equitable)', fontsize=12, fontweight='bold')
 ax1.set_title('Trade-off: Innovation vs Equity', fontsize=14, fontweight='bold')
@@ -207,11 +182,10 @@ ax1.grid(True, alpha=0.3)
 
 # Subplot 2: Innovation vs Diversity
 ax2 = fig.add_subplot(132)
-for cluster_id in range(4):
+for cluster_id in range(N_CLUSTERS):
     cluster_df = df[df['Cluster'] == cluster_id]
-    profile = [p for p in cluster_profiles if p['id'] == cluster_id][0]
     ax2.scatter(cluster_df['Innovation']/1000, cluster_df['Diversity'], 
-                label=profile['name'], s=120, alpha=0.7)
+                label=names[cluster_id], s=120, alpha=0.7)
 ax2.set_xlabel('Innovation (×1000)', fontsize=12, fontweight='bold')
 ax2.set_ylabel('Cultural Diversity\n(Shannon Index)', fontsize=12, fontweight='bold')
 ax2.set_title('Trade-off: Innovation vs Diversity', fontsize=14, fontweight='bold')
@@ -220,11 +194,10 @@ ax2.grid(True, alpha=0.3)
 
 # Subplot 3: Diversity vs Gini
 ax3 = fig.add_subplot(133)
-for cluster_id in range(4):
+for cluster_id in range(N_CLUSTERS):
     cluster_df = df[df['Cluster'] == cluster_id]
-    profile = [p for p in cluster_profiles if p['id'] == cluster_id][0]
     ax3.scatter(cluster_df['Diversity'], cluster_df['Gini'], 
-                label=profile['name'], s=120, alpha=0.7)
+                label=names[cluster_id], s=120, alpha=0.7)
 ax3.set_xlabel('Cultural Diversity', fontsize=12, fontweight='bold')
 ax3.set_ylabel('Gini Coefficient', fontsize=12, fontweight='bold')
 ax3.set_title('Trade-off: Diversity vs Equity', fontsize=14, fontweight='bold')
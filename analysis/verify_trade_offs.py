@@ -4,26 +4,25 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 
+from streaming_analytics import GINI_THRESHOLD, PARAM_COLS, PARAM_NAMES, read_chunks, trade_off_statistics
+
 print("="*70)
 print("  VERIFICATION OF GEMINI CLAIMS - DEEP ANALYSIS")
 print("="*70)
 
 # Load all 6 runs
 base_dir = Path('results/archive/')
-files = list(base_dir.glob('*_pareto_results_final.csv'))
-
-all_solutions = []
-for f in files:
-    df = pd.read_csv(f)
-    df['Innovation'] = -df['Obj_Innov_Neg']
-    df['Diversity'] = -df['Obj_Div_Neg']
-    df['Gini'] = df['Obj_Gini']
-    all_solutions.append(df)
+files = sorted(base_dir.glob('*_pareto_results_final.csv'))
 
-combined = pd.concat(all_solutions, ignore_index=True)
+# Statistics in one pass over the files; the rows are kept only for the figures
+stats = trade_off_statistics(read_chunks(files))
+moments, middle = stats["all"], stats["middle"]
+combined = pd.concat(read_chunks(files), ignore_index=True)
+# Model names of the abbreviated parameter columns
+model_names = {short: name for name, short in PARAM_NAMES.items()}
 
-print(f"\nTotal solutions analyzed: {len(combined)}")
-print(f"Parameters: {[c for c in combined.columns if 'bridging' in c or 'diffusion' in c or 'policy' in c or 'cultural' in c]}")
+print(f"\nTotal solutions analyzed: {moments.n}")
+print(f"Parameters: {list(PARAM_NAMES)}")
 
 # ============================================================================
 # CLAIM 1: "No trade-off between Innovation and Diversity"
@@ -32,12 +31,12 @@ print("\n" + "="*70)
 print("CLAIM 1: Innovation-Diversity Trade-off")
 print("="*70)
 
-correlation = combined[['Innovation', 'Diversity']].corr().iloc[0, 1]
+correlation = moments.correlation().loc['Innovation', 'Diversity']
 print(f"\nCorrelation Innovation-Diversity: {correlation:.3f}")
 
 # Find extremes
-max_innov_sol = combined.loc[combined['Innovation'].idxmax()]
-max_div_sol = combined.loc[combined['Diversity'].idxmax()]
+max_innov_sol = stats["max_innovation"].row
+max_div_sol = stats["max_diversity"].row
 
 print(f"\nMax Innovation solution:")
 print(f"  Innovation: {max_innov_sol['Innovation']:,.0f}")
@@ -65,25 +64,27 @@ print("\n" + "="*70)
 print("CLAIM 2: Middle Ground Performance")
 print("="*70)
 
-# Define "Middle Ground" as solutions with Gini < 0.11
-middle_ground = combined[combined['Gini'] <= 0.11]
+# Define "Middle Ground" as solutions with Gini <= GINI_THRESHOLD
+middle_ground = combined[combined['Gini'] <= GINI_THRESHOLD]
+middle_range = {c: (middle.min[i], middle.max[i], middle.mean[i], s)
+                for i, (c, s) in enumerate(zip(middle.columns, middle.std()))}
 
-if len(middle_ground) > 0:
-    mg_max_innov = middle_ground['Innovation'].max()
-    global_max_innov = combined['Innovation'].max()
+if middle.n > 0:
+    mg_max_innov = middle_range['Innovation'][1]
+    global_max_innov = moments.max[moments.columns.index('Innovation')]
     percentage = (mg_max_innov / global_max_innov) * 100
     
     print(f"\nGlobal max innovation: {global_max_innov:,.0f}")
-    print(f"Middle Ground (Gini<=0.11) max innovation: {mg_max_innov:,.0f}")
+    print(f"Middle Ground (Gini<={GINI_THRESHOLD}) max innovation: {mg_max_innov:,.0f}")
     print(f"Percentage achieved: {percentage:.1f}%")
-    print(f"Number of solutions with Gini<=0.11: {len(middle_ground)}")
+    print(f"Number of solutions with Gini<={GINI_THRESHOLD}: {middle.n}")
     
     if abs(percentage - 80) < 10:
         print(f"\n✅ CLAIM 2 TRUE: {percentage:.1f}% ≈ 80%")
     else:
         print(f"\n❌ CLAIM 2 FALSE: {percentage:.1f}% ≠ 80%")
 else:
-    print("\n❌ No solutions with Gini <= 0.11 found!")
+    print(f"\n❌ No solutions with Gini <= {GINI_THRESHOLD} found!")
 
 # ============================================================================
 # CLAIM 3: "Cultural Diffusion Rate 42-68% for optimal results"
@@ -92,25 +93,24 @@ print("\n" + "="*70)
 print("CLAIM 3: Cultural Diffusion Rate Range")
 print("="*70)
 
-# Check if column exists
-param_cols = [c for c in combined.columns if 'cultural' in c.lower() and 'diffusion' in c.lower()]
+# read_chunks names the cultural diffusion rate Cultural_Diff
+param_cols = ['Cultural_Diff']
 
 if len(param_cols) > 0:
     param_name = param_cols[0]
-    print(f"\nParameter found: '{param_name}'")
+    print(f"\nParameter found: '{model_names[param_name]}'")
     
-    # Analyze for Gini <= 0.11 solutions
-    if len(middle_ground) > 0:
-        mg_cultural = middle_ground[param_name]
+    # Analyze for Gini <= GINI_THRESHOLD solutions
+    if middle.n > 0:
+        actual_min, actual_max, mg_mean, _ = middle_range[param_name]
         
-        print(f"\nFor solutions with Gini <= 0.11:")
-        print(f"  Cultural diffusion range: {mg_cultural.min():.3f} - {mg_cultural.max():.3f}")
-        print(f"  Mean: {mg_cultural.mean():.3f}")
-        print(f"  Median: {mg_cultural.median():.3f}")
+        print(f"\nFor solutions with Gini <= {GINI_THRESHOLD}:")
+        print(f"  Cultural diffusion range: {actual_min:.3f} - {actual_max:.3f}")
+        print(f"  Mean: {mg_mean:.3f}")
+        print(f"  Median: ≈{stats['middle_median'][param_name].value():.3f} (P-square estimate)")
         
         # Check if range overlaps with 0.42-0.68
         claimed_min, claimed_max = 0.42, 0.68
-        actual_min, actual_max = mg_cultural.min(), mg_cultural.max()
         
         overlap = (max(claimed_min, actual_min) <= min(claimed_max, actual_max))
         
@@ -131,16 +131,13 @@ print("\n" + "="*70)
 print("DETAILED PARAMETER RANGES FOR LOW GINI SOLUTIONS")
 print("="*70)
 
-if len(middle_ground) > 0:
-    param_cols_all = [c for c in combined.columns if any(x in c.lower() 
-                     for x in ['bridging', 'diffusion', 'policy', 'cultural'])]
-    
-    for col in param_cols_all:
-        vals = middle_ground[col]
-        print(f"\n{col}:")
-        print(f"  Range: {vals.min():.3f} - {vals.max():.3f}")
-        print(f"  Mean:  {vals.mean():.3f}")
-        print(f"  Std:   {vals.std():.3f}")
+if middle.n > 0:
+    for col in PARAM_COLS:
+        vmin, vmax, vmean, vstd = middle_range[col]
+        print(f"\n{model_names[col]}:")
+        print(f"  Range: {vmin:.3f} - {vmax:.3f}")
+        print(f"  Mean:  {vmean:.3f}")
+        print(f"  Std:   {vstd:.3f}")
 
 # ============================================================================
 # VISUALIZATIONS
@@ -169,12 +166,12 @@ ax.legend()
 
 # Plot 2: Innovation distribution for Low vs High Gini
 ax = axes[0, 1]
-low_gini = combined[combined['Gini'] <= 0.11]['Innovation']
-high_gini = combined[combined['Gini'] > 0.11]['Innovation']
+low_gini = combined[combined['Gini'] <= GINI_THRESHOLD]['Innovation']
+high_gini = combined[combined['Gini'] > GINI_THRESHOLD]['Innovation']
 
 if len(low_gini) > 0 and len(high_gini) > 0:
-    ax.hist(low_gini, bins=20, alpha=0.6, label='Gini ≤ 0.11', color='green')
-    ax.hist(high_gini, bins=20, alpha=0.6, label='Gini > 0.11', color='orange')
+    ax.hist(low_gini, bins=20, alpha=0.6, label=f'Gini ≤ {GINI_THRESHOLD}', color='green')
+    ax.hist(high_gini, bins=20, alpha=0.6, label=f'Gini > {GINI_THRESHOLD}', color='orange')
     ax.set_xlabel('Innovation', fontsize=12)
     ax.set_ylabel('Frequency', fontsize=12)
     ax.set_title('Innovation Distribution by Gini Level', fontsize=13, fontweight='bold')
@@ -190,7 +187,7 @@ if len(param_cols) > 0:
     
     ax.hist(param, bins=30, alpha=0.5, label='All solutions', color='gray')
     if len(param_mg) > 0:
-        ax.hist(param_mg, bins=30, alpha=0.7, label='Gini ≤ 0.11', color='green')
+        ax.hist(param_mg, bins=30, alpha=0.7, label=f'Gini ≤ {GINI_THRESHOLD}', color='green')
     
     # Mark claimed range 42-68%
     ax.axvspan(0.42, 0.68, alpha=0.2, color='blue', label='Claimed range (42-68%)')
@@ -208,12 +205,12 @@ ax.scatter(combined['Innovation'], combined['Gini'],
           alpha=0.4, s=30, color='gray', label='All solutions')
 if len(middle_ground) > 0:
     ax.scatter(middle_ground['Innovation'], middle_ground['Gini'], 
-              alpha=0.8, s=50, color='green', label='Gini ≤ 0.11 (Middle Ground)')
+              alpha=0.8, s=50, color='green', label=f'Gini ≤ {GINI_THRESHOLD} (Middle Ground)')
 
 ax.set_xlabel('Innovation', fontsize=12)
 ax.set_ylabel('Gini Coefficient', fontsize=12)
 ax.set_title('Innovation vs Inequality\n(Middle Ground highlighted)', fontsize=13, fontweight='bold')
-ax.axhline(0.11, color='red', linestyle='--', label='Gini = 0.11 threshold')
+ax.axhline(GINI_THRESHOLD, color='red', linestyle='--', label=f'Gini = {GINI_THRESHOLD} threshold')
 ax.legend()
 ax.invert_yaxis()
 
@@ -237,7 +234,7 @@ else:
     verdicts.append("✅ CLAIM 1 (No trade-off): TRUE/PARTIAL")
 
 # Claim 2
-if len(middle_ground) > 0:
+if middle.n > 0:
     if abs(percentage - 80) < 10:
         verdicts.append(f"✅ CLAIM 2 (80% performance): TRUE ({percentage:.1f}%)")
     else:
@@ -246,7 +243,7 @@ else:
     verdicts.append("❌ CLAIM 2: Cannot verify")
 
 # Claim 3
-if len(param_cols) > 0 and len(middle_ground) > 0:
+if len(param_cols) > 0 and middle.n > 0:
     if overlap and (actual_min <= 0.45 and actual_max >= 0.65):
         verdicts.append("✅ CLAIM 3 (42-68% cultural diffusion): TRUE")
     else:
@@ -0,0 +1,214 @@
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from nsga2_optimization import (NetLogoOptimization, CheckpointCallback, MemoryScheduler, build_algorithm,
+                                build_snapshots, full_horizon_front, real_front, result_provenance, save_results)
+from run_outputs import output_path
+
+# Seeds of the robustness study behind results/archive/
+DEFAULT_SEEDS = [17, 23, 24, 34, 36, 42]
+CAMPAIGNS_DIR = "campaigns"
+PROGRESS_INTERVAL = 30
+
+
+class FairShare:
+    """Splits the shared pool's slots between campaigns.
+
+    Every campaign with pending work gets an equal share; slots a campaign
+    cannot fill are lent to the campaigns that have more work waiting. The
+    one memory scheduler of the process admits runs for all campaigns
+    together: it sees the in-flight runs of every campaign, and runs it
+    admitted to a campaign that has not reported them in flight yet are not
+    in the free memory reading, so they are taken off the room left.
+    """
+    def __init__(self, slots, memory):
+        self.slots = slots
+        self.memory = memory
+        self.lock = threading.Lock()
+        self.demand = {}
+        self.in_flight = {}
+        self.admitted = {}
+
+    def limit(self, name, in_flight, waiting):
+        with self.lock:
+            self.demand[name] = in_flight + waiting
+            active = [d for d in self.demand.values() if d > 0]
+            base = max(1, self.slots // max(1, len(active)))
+            unused = self.slots - sum(min(d, base) for d in active)
+            hungry = sum(1 for d in active if d > base)
+            extra = unused // hungry if hungry and self.demand[name] > base else 0
+            share = base + max(0, extra)
+
+            self.in_flight[name] = in_flight
+            self.admitted[name] = 0
+            total = sum(self.in_flight.values())
+            room = max(0, self.memory.concurrency(total, waiting) - total - sum(self.admitted.values()))
+            limit = min(share, in_flight + room)
+            self.admitted[name] = max(0, min(limit, in_flight + waiting) - in_flight)
+            return limit
+
+    def release(self, name):
+        with self.lock:
+            self.demand[name] = 0
+            self.in_flight[name] = 0
+            self.admitted[name] = 0
+
+
+class CampaignScheduler:
+    """One campaign's view of the fair share and the process-wide memory scheduler."""
+    def __init__(self, share, name):
+        self.share = share
+        self.name = name
+        self.memory = share.memory
+        self.enabled = share.memory.enabled
+
+    def concurrency(self, in_flight, waiting=0):
+        return self.share.limit(self.name, in_flight, waiting)
+
+    def observe(self, peak_mb):
+        self.memory.observe(peak_mb)
+
+    def worker_mb(self):
+        return self.memory.worker_mb()
+
+    def end_generation(self):
+        return self.memory.end_generation()
+
+
+def campaign_configs(base_config, specs):
+    """One config per campaign: a bare seed, or a JSON file of overrides."""
+    campaigns = []
+    for spec in specs or [str(s) for s in DEFAULT_SEEDS]:
+        if spec.endswith(".json"):
+            with open(spec, 'r') as f:
+                overrides = json.load(f)
+            name = os.path.splitext(os.path.basename(spec))[0]
+        else:
+            overrides = {"SEED": int(spec), "CRN_SEED": int(spec)}
+            name = spec
+        config = {**base_config, **overrides}
+        config["OUTPUT_DIR"] = os.path.join(CAMPAIGNS_DIR, name)
+        if "VERBOSE_EVALUATIONS" not in overrides:
+            config["VERBOSE_EVALUATIONS"] = False
+        campaigns.append((name, config))
+    return campaigns
+
+
+def run_campaign(campaign, share):
+    """ask/tell loop of one campaign; evaluations go to the shared pool."""
+    problem, algorithm = campaign["problem"], campaign["algorithm"]
+    try:
+        while algorithm.has_next():
+            pop = algorithm.ask()
+            algorithm.evaluator.eval(problem, pop, algorithm=algorithm)
+            share.release(campaign["name"])
+            algorithm.tell(infills=pop)
+
+        res = algorithm.result()
+        config = campaign["config"]
+        final_file = output_path(config, "pareto_results_final.csv")
+        save_results(*full_horizon_front(res, config), problem.param_names, final_file, result_provenance(config))
+        # Same naming as results/archive/
+        archive_dir = os.path.join(CAMPAIGNS_DIR, "archive")
+        os.makedirs(archive_dir, exist_ok=True)
+        shutil.copy(final_file, os.path.join(archive_dir, f"{campaign['name']}_pareto_results_final.csv"))
+        campaign["status"] = "done"
+    except Exception as e:
+        campaign["status"] = f"failed: {e}"
+    finally:
+        share.release(campaign["name"])
+
+
+def progress_table(campaigns, start):
+    rows = []
+    for c in campaigns:
+        algorithm = c["algorithm"]
+        # Placeholders of early-stopped candidates are not results
+        pop = algorithm.pop
+        F = pop.get("F")[real_front(pop, c["config"]["MAX_TICKS"])] if pop is not None else np.empty((0, 3))
+        rows.append({
+            "Campaign": c["name"],
+            "Generation": (algorithm.n_gen or 1) - 1,
+            "N_Generations": c["config"].get("N_GENERATIONS", 50),
+            "Evaluations": algorithm.evaluator.n_eval,
+            "Front_Size": len(F),
+            "Best_Innovation": -F[:, 0].min() if len(F) else np.nan,
+            "Best_Diversity": -F[:, 1].min() if len(F) else np.nan,
+            "Min_Gini": F[:, 2].min() if len(F) else np.nan,
+            "Status": c["status"],
+            "Elapsed_min": (time.time() - start) / 60
+        })
+    return pd.DataFrame(rows)
+
+
+def show_progress(campaigns, start, out_dir=CAMPAIGNS_DIR):
+    df = progress_table(campaigns, start)
+    df.to_csv(os.path.join(out_dir, "progress.csv"), index=False)
+    print("\n📋 Campaign progress")
+    print(df.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method('spawn', force=True)
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 campaign_runner.py nsga2_config_final.json [seed | campaign.json ...]")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r') as f:
+        base_config = json.load(f)
+
+    n_cpu = multiprocessing.cpu_count()
+    configs = campaign_configs(base_config, sys.argv[2:])
+    print(f"--- Starting {len(configs)} campaigns on one shared pool (CPUs: {n_cpu}) ---")
+
+    pool = multiprocessing.Pool(n_cpu)
+    manager = multiprocessing.Manager()
+    try:
+        share = FairShare(n_cpu, MemoryScheduler(base_config, n_cpu))
+
+        if base_config.get("SNAPSHOT_MODE", False):
+            seeds = sorted({s for _, config in configs for s in config["SNAPSHOT_SEEDS"]})
+            build_snapshots(pool, base_config, seeds)
+
+        campaigns = []
+        for name, config in configs:
+            problem = NetLogoOptimization(config, n_threads=n_cpu, pool=pool)
+            problem.supervisor.manager = manager
+            problem.supervisor.scheduler = CampaignScheduler(share, name)
+            algorithm = build_algorithm(config, problem)
+            algorithm.setup(problem,
+                            termination=('n_gen', config.get("N_GENERATIONS", 50)),
+                            seed=config.get("SEED", 42),
+                            callback=CheckpointCallback(problem.param_names,
+                                                        output_path(config, "pareto_results_checkpoint.csv")),
+                            verbose=False)
+            campaigns.append({"name": name, "config": config, "problem": problem, "algorithm": algorithm,
+                              "status": "running"})
+
+        start = time.time()
+        threads = [threading.Thread(target=run_campaign, args=(c, share), daemon=True) for c in campaigns]
+        for t in threads:
+            t.start()
+
+        interval = base_config.get("PROGRESS_INTERVAL", PROGRESS_INTERVAL)
+        while any(t.is_alive() for t in threads):
+            for t in threads:
+                t.join(timeout=interval / len(threads))
+            show_progress(campaigns, start)
+
+        print("\n--- All Campaigns Complete ---")
+        show_progress(campaigns, start)
+        print(f"Per-campaign results saved in {CAMPAIGNS_DIR}/<campaign>/ and {CAMPAIGNS_DIR}/archive/")
+    finally:
+        manager.shutdown()
+        pool.close()
+        pool.join()
@@ -0,0 +1,85 @@
+import json
+import os
+import sys
+import tempfile
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+from nsga2_optimization import run_netlogo_process
+
+# Headless pass/fail check of the model's fast kernels (PTRS Poisson draws
+# and the cached household Gini). Every seed runs setup and a few ticks at
+# the centre of the bounds, then reports fast-kernel-failures, which is an
+# empty list when every threshold holds. Exits 1 on any failure.
+#
+# Usage: python3 check_model_kernels.py nsga2_config_final.json [--seeds 1 2 3] [--ticks 20] [--draws 20000]
+
+CHECK_XML = """
+<experiments>
+  <experiment name="kernel_check" repetitions="1" runMetricsEveryStep="false">
+    <setup>setup</setup>
+    <go>go</go>
+    <timeLimit steps="{ticks}"/>
+    <metric>fast-kernel-failures {draws}</metric>
+    <enumeratedValueSet variable="external-seed">
+      {seeds}
+    </enumeratedValueSet>
+    {enumerated_values}
+  </experiment>
+</experiments>
+"""
+
+
+def option(args, name, default):
+    if name not in args:
+        return default
+    k = args.index(name)
+    values = []
+    for a in args[k + 1:]:
+        if a.startswith("--"):
+            break
+        values.append(int(a))
+    return values
+
+
+def check_kernels(config, seeds, ticks, draws):
+    """fast-kernel-failures of every seed, as the strings NetLogo writes to the table."""
+    point = {k: (lo + hi) / 2 for k, (lo, hi) in config["PARAM_BOUNDS"].items()}
+    values = "\n    ".join(f'<enumeratedValueSet variable="{k}"><value value="{escape(str(v))}"/></enumeratedValueSet>'
+                           for k, v in point.items())
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_file = os.path.join(tmp, "kernel_check.xml")
+        csv_file = os.path.join(tmp, "kernel_check.csv")
+        with open(xml_file, "w") as f:
+            f.write(CHECK_XML.format(ticks=ticks, draws=draws, enumerated_values=values,
+                                     seeds="\n      ".join(f'<value value="{s}"/>' for s in seeds)))
+        run_netlogo_process([config["NETLOGO_PATH"], "--headless", "--model", config["MODEL_PATH"],
+                             "--setup-file", xml_file, "--table", csv_file],
+                            {**config, "SIMULATION_TIMEOUT": config.get("SIMULATION_TIMEOUT", 300) * len(seeds)})
+        df = pd.read_csv(csv_file, skiprows=6)
+    df.columns = [c.replace('"', '').strip() for c in df.columns]
+    failures = next(c for c in df.columns if c.startswith("fast-kernel-failures"))
+    return dict(zip(df["external-seed"], df[failures].astype(str)))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) < 1:
+        print("Usage: python3 check_model_kernels.py nsga2_config_final.json [--seeds 1 2 3] [--ticks 20] [--draws 20000]")
+        sys.exit(1)
+
+    with open(args[0], 'r') as f:
+        config = json.load(f)
+    seeds = option(args, "--seeds", [1, 2, 3])
+    ticks = option(args, "--ticks", [20])[0]
+    draws = option(args, "--draws", [20000])[0]
+
+    print(f"--- Fast kernel check: seeds {seeds}, {ticks} ticks, {draws} Poisson draws per lambda ---")
+    results = check_kernels(config, seeds, ticks, draws)
+    failed = {seed: report for seed, report in results.items() if report.strip() != "[]"}
+    for seed in seeds:
+        print(f"{'❌' if seed in failed else '✅'} seed {seed}: {results.get(seed, 'no result')}")
+    if failed or len(results) < len(seeds):
+        sys.exit(1)
+    print("✅ All fast kernel checks passed")
@@ -0,0 +1,152 @@
+import json
+import sys
+
+import numpy as np
+
+from numpy_engine import (adjacency, closeness_centrality, gini_coefficient, model_globals, normalized_shannon,
+                          patch_coordinate, preferential_attachment_edges, run_numpy_simulation,
+                          small_world_edges, unique_edges, weighted_n_of, wrapped_delta)
+
+# Deterministic pass/fail checks of the NumPy port's kernels, runnable
+# without NetLogo. Every check compares a kernel against values worked out
+# by hand (or against an invariant of the NetLogo primitive it stands for)
+# and returns a list of failures, empty when it holds. Exits 1 on any failure.
+#
+# These checks cover the kernels only: the port as a whole does not
+# reproduce the model's distributions (see numpy_engine.py), which is why it
+# is not an optimizer backend.
+#
+# Usage: python3 check_numpy_kernels.py nsga2_config_final.json [--ticks 10]
+
+TOL = 1e-12
+# Seeded draws: 5 standard errors keep the checks deterministic and loose enough
+Z_MAX = 5
+N_DRAWS = 20000
+
+
+def close(name, got, expected, tol=TOL):
+    return [] if abs(got - expected) <= tol else [f"{name}: {got} != {expected}"]
+
+
+def check_statistics():
+    failures = []
+    failures += close("gini of equal incomes", gini_coefficient(np.ones(4)), 0.0)
+    failures += close("gini of one earner in four", gini_coefficient(np.array([0.0, 0.0, 0.0, 1.0])), 0.75)
+    failures += close("gini of unsorted incomes", gini_coefficient(np.array([3.0, 1.0, 2.0])),
+                      gini_coefficient(np.array([1.0, 2.0, 3.0])))
+    failures += close("gini of zero incomes", gini_coefficient(np.zeros(3)), 0.0)
+    failures += close("shannon of one identity", normalized_shannon(np.array([1, 1, 1])), 0.0)
+    failures += close("shannon of two even identities", normalized_shannon(np.array([1, 1, 2, 2])), 1.0)
+    p = np.array([0.5, 0.25, 0.25])
+    failures += close("shannon of uneven identities", normalized_shannon(np.array([1, 2, 3, 1])),
+                      -(p * np.log(p)).sum() / np.log(3))
+    return failures
+
+
+def check_geometry():
+    failures = []
+    failures += close("wrapped distance across the edge", float(wrapped_delta(-16, 16)), 1.0)
+    failures += close("wrapped distance inside the world", float(wrapped_delta(-3, 4)), 7.0)
+    failures += close("patch of a wrapped coordinate", float(patch_coordinate(np.array([16.6]))[0]), -16.0)
+    failures += close("patch of an inner coordinate", float(patch_coordinate(np.array([2.4]))[0]), 2.0)
+    return failures
+
+
+def check_networks(rng):
+    failures = []
+    edges = unique_edges(np.array([0, 1, 1, 2]), np.array([1, 0, 2, 2]))
+    if edges.tolist() != [[0, 1], [1, 2]]:
+        failures.append(f"unique_edges keeps self-loops or duplicates: {edges.tolist()}")
+    adj = adjacency(np.array([[0, 1], [1, 0], [1, 2]]), 4)
+    if (adj != adj.T).nnz or adj.nnz != 4 or adj.max() != 1:
+        failures.append("adjacency is not a symmetric 0/1 matrix of the distinct edges")
+    closeness = closeness_centrality(adj)
+    for node, expected in enumerate([2 / 3, 1.0, 2 / 3, 0.0]):
+        failures += close(f"closeness of path node {node}", closeness[node], expected)
+
+    rows, cols = 4, 5
+    n = rows * cols
+    sw = {tuple(e) for e in small_world_edges(rows, cols, 2.0, rng).tolist()}
+    r, c = np.divmod(np.arange(n), cols)
+    lattice = {tuple(sorted(e)) for k in range(n)
+               for e in [(k, r[k] * cols + (c[k] + 1) % cols), (k, ((r[k] + 1) % rows) * cols + c[k])]}
+    if not lattice <= sw or len(sw) > len(lattice) + n:
+        failures.append("small world is not the toroidal lattice plus at most one long link per node")
+
+    pa = preferential_attachment_edges(30, 2, rng)
+    if len(pa) != 2 * (30 - 2):
+        failures.append(f"preferential attachment made {len(pa)} links, expected {2 * (30 - 2)}")
+    if (closeness_centrality(adjacency(pa, 30)) == 0).any():
+        failures.append("preferential attachment network is not connected")
+    return failures
+
+
+def check_selection(rng):
+    failures = []
+    picks = weighted_n_of(2, np.array([0.0, 1.0, 1.0, 0.0]), rng, size=100)
+    if set(np.unique(picks)) != {1, 2}:
+        failures.append("weighted_n_of draws zero weights before the positive ones run out")
+    picks = weighted_n_of(3, np.array([1.0, 2.0, 3.0, 4.0, 5.0]), rng, size=100)
+    if any(len(set(row)) != 3 for row in picks):
+        failures.append("weighted_n_of draws with replacement")
+    # One draw of two weights: P(second) = 3/4
+    share = (weighted_n_of(1, np.array([1.0, 3.0]), rng, size=N_DRAWS)[:, 0] == 1).mean()
+    z = (share - 0.75) / np.sqrt(0.75 * 0.25 / N_DRAWS)
+    if abs(z) > Z_MAX:
+        failures.append(f"weighted_n_of picks weight 3 of 4 at rate {share:.4f} (z={z:.1f})")
+    return failures
+
+
+def check_globals():
+    failures = []
+    g = model_globals({"mutation-prob": 1.5, "imitation-prob": -0.2, "initial-cultures": 0.0})
+    failures += close("mutation-prob clamped", g["mutation-prob"], 1.0)
+    failures += close("imitation-prob clamped", g["imitation-prob"], 0.0)
+    failures += close("initial-cultures floor", g["initial-cultures"], 1.0)
+    failures += close("max-cultures floor", g["max-cultures"], 2)
+    g = model_globals({"mutation-prob": 0.3, "initial-cultures": 5.7}, apply_params=False)
+    failures += close("parameters ignored without apply_params", g["mutation-prob"], 0.0)
+    g = model_globals({"initial-cultures": 5.7})
+    failures += close("max-cultures of 5.7 cultures", g["max-cultures"], 5)
+    return failures
+
+
+def check_run(config, ticks):
+    """A seeded run is reproducible and its objectives lie in their ranges."""
+    failures = []
+    params = {k: (lo + hi) / 2 for k, (lo, hi) in config["PARAM_BOUNDS"].items()}
+    first = run_numpy_simulation(params, {}, 7, ticks)
+    if first != run_numpy_simulation(params, {}, 7, ticks):
+        failures.append("the same seed gave two different runs")
+    if not np.isfinite([first["innovation"], first["diversity"], first["gini"]]).all():
+        failures.append(f"non-finite objectives: {first}")
+    if not (0 <= first["diversity"] <= 1 and 0 <= first["gini"] <= 1):
+        failures.append(f"diversity or gini outside [0, 1]: {first}")
+    return failures
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) < 1:
+        print("Usage: python3 check_numpy_kernels.py nsga2_config_final.json [--ticks 10]")
+        sys.exit(1)
+
+    with open(args[0], 'r') as f:
+        config = json.load(f)
+    ticks = int(args[args.index("--ticks") + 1]) if "--ticks" in args else 10
+    rng = np.random.default_rng(20240519)
+
+    print(f"--- NumPy kernel check ({ticks}-tick seeded run) ---")
+    results = {
+        "statistics": check_statistics(),
+        "geometry": check_geometry(),
+        "networks": check_networks(rng),
+        "selection": check_selection(rng),
+        "globals": check_globals(),
+        "seeded run": check_run(config, ticks),
+    }
+    for name, failures in results.items():
+        print(f"{'❌' if failures else '✅'} {name}: {failures if failures else 'ok'}")
+    if any(results.values()):
+        sys.exit(1)
+    print("✅ All NumPy kernel checks passed")
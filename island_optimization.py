@@ -0,0 +1,179 @@
+import copy
+import json
+import os
+import sys
+import threading
+import time
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from pymoo.core.population import Population
+from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
+
+from nsga2_optimization import (NetLogoOptimization, CheckpointCallback, MemoryScheduler, build_algorithm,
+                                build_snapshots, full_horizon_front, real_front, result_provenance, save_results)
+from run_outputs import output_path
+from campaign_runner import FairShare, CampaignScheduler, show_progress
+
+ISLANDS_DIR = "islands"
+
+
+def island_configs(base_config):
+    n_islands = base_config.get("N_ISLANDS", 4)
+    seeds = base_config.get("ISLAND_SEEDS") or [base_config.get("SEED", 42) + k for k in range(n_islands)]
+    configs = []
+    for k, seed in enumerate(seeds):
+        config = {**base_config, "SEED": seed}
+        config["OUTPUT_DIR"] = os.path.join(ISLANDS_DIR, f"island_{k}")
+        config["VERBOSE_EVALUATIONS"] = base_config.get("VERBOSE_EVALUATIONS", False)
+        configs.append((f"island_{k}", config))
+    return configs
+
+
+def emigrants(algorithm, n_migrants, rng):
+    """A random sample of the island's real front; placeholders of early-stopped candidates never migrate."""
+    pop = algorithm.pop
+    front = real_front(pop, algorithm.problem.config["MAX_TICKS"])
+    if len(front) == 0:
+        return Population()
+    picked = rng.choice(front, size=min(n_migrants, len(front)), replace=False)
+    return copy.deepcopy(pop[picked])
+
+
+def migrate(islands, n_migrants, rng):
+    """Ring migration: every island sends part of its front to the next one.
+
+    Migrants keep their objectives, so they join the receiver's population
+    through its normal rank-and-crowding survival without being re-simulated.
+    """
+    outgoing = [emigrants(isl["algorithm"], n_migrants, rng) for isl in islands]
+    moved = 0
+    for k, isl in enumerate(islands):
+        algorithm = isl["algorithm"]
+        migrants = outgoing[k - 1]
+        if len(migrants) == 0:
+            continue
+        migrants = algorithm.eliminate_duplicates.do(migrants, algorithm.pop)
+        if len(migrants) == 0:
+            continue
+        # Migrants are real results: the receiver's placeholders must stay behind them too
+        algorithm.problem.observe_full(migrants.get("F"))
+        algorithm.problem.refresh_placeholders(algorithm.pop)
+        merged = Population.merge(algorithm.pop, migrants)
+        algorithm.pop = algorithm.survival.do(algorithm.problem, merged, n_survive=algorithm.pop_size,
+                                              algorithm=algorithm)
+        moved += len(migrants)
+    print(f"🏝️  Migration: {moved} individuals moved between {len(islands)} islands")
+
+
+def run_island(island, share, barrier, interval):
+    """ask/tell loop of one island, meeting the others every `interval` generations."""
+    problem, algorithm = island["problem"], island["algorithm"]
+    try:
+        while algorithm.has_next():
+            pop = algorithm.ask()
+            algorithm.evaluator.eval(problem, pop, algorithm=algorithm)
+            share.release(island["name"])
+            algorithm.tell(infills=pop)
+            completed = algorithm.n_gen - 1
+            if interval > 0 and completed % interval == 0 and algorithm.has_next():
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError:
+                    # Another island failed; carry on without migration
+                    pass
+
+        res = algorithm.result()
+        save_results(*full_horizon_front(res, island["config"]), problem.param_names,
+                     output_path(island["config"], "pareto_results_final.csv"), result_provenance(island["config"]))
+        island["status"] = "done"
+    except Exception as e:
+        island["status"] = f"failed: {e}"
+        barrier.abort()
+    finally:
+        share.release(island["name"])
+
+
+def merge_islands(islands, param_names):
+    """Writes the merged checkpoint and the non-dominated front over all islands in the usual formats."""
+    checkpoints = [pd.read_csv(output_path(isl["config"], "pareto_results_checkpoint.csv"), dtype={"Model_Version": str})
+                   for isl in islands]
+    pd.concat(checkpoints, ignore_index=True).to_csv(os.path.join(ISLANDS_DIR, "pareto_results_checkpoint.csv"),
+                                                     index=False)
+
+    finals = [pd.read_csv(output_path(isl["config"], "pareto_results_final.csv"), dtype={"Model_Version": str})
+              for isl in islands if isl["status"] == "done"]
+    if not finals:
+        return
+    merged = pd.concat(finals, ignore_index=True).drop_duplicates(subset=param_names)
+    F = merged[["Obj_Innov_Neg", "Obj_Div_Neg", "Obj_Gini"]].to_numpy()
+    front = NonDominatedSorting().do(F, only_non_dominated_front=True)
+    save_results(merged[param_names].to_numpy()[front], F[front], param_names,
+                 os.path.join(ISLANDS_DIR, "pareto_results_final.csv"), result_provenance(islands[0]["config"]))
+
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method('spawn', force=True)
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 island_optimization.py nsga2_config_final.json")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r') as f:
+        base_config = json.load(f)
+
+    n_cpu = multiprocessing.cpu_count()
+    configs = island_configs(base_config)
+    interval = base_config.get("MIGRATION_INTERVAL", 5)
+    print(f"--- Starting {len(configs)} NSGA-II islands, migration every {interval} generations (CPUs: {n_cpu}) ---")
+
+    pool = multiprocessing.Pool(n_cpu)
+    manager = multiprocessing.Manager()
+    try:
+        share = FairShare(n_cpu, MemoryScheduler(base_config, n_cpu))
+
+        if base_config.get("SNAPSHOT_MODE", False):
+            seeds = base_config["SNAPSHOT_SEEDS"]
+            build_snapshots(pool, base_config, seeds)
+
+        islands = []
+        for name, config in configs:
+            problem = NetLogoOptimization(config, n_threads=n_cpu, pool=pool)
+            problem.supervisor.manager = manager
+            problem.supervisor.scheduler = CampaignScheduler(share, name)
+            algorithm = build_algorithm(config, problem)
+            algorithm.setup(problem,
+                            termination=('n_gen', config.get("N_GENERATIONS", 50)),
+                            seed=config["SEED"],
+                            callback=CheckpointCallback(problem.param_names,
+                                                        output_path(config, "pareto_results_checkpoint.csv")),
+                            verbose=False)
+            islands.append({"name": name, "config": config, "problem": problem, "algorithm": algorithm,
+                            "status": "running"})
+
+        rng = np.random.default_rng(base_config.get("SEED", 42))
+        barrier = threading.Barrier(len(islands),
+                                    action=lambda: migrate(islands, base_config.get("N_MIGRANTS", 3), rng))
+
+        start = time.time()
+        threads = [threading.Thread(target=run_island, args=(isl, share, barrier, interval), daemon=True)
+                   for isl in islands]
+        for t in threads:
+            t.start()
+
+        progress_interval = base_config.get("PROGRESS_INTERVAL", 30)
+        while any(t.is_alive() for t in threads):
+            for t in threads:
+                t.join(timeout=progress_interval / len(threads))
+            show_progress(islands, start, ISLANDS_DIR)
+
+        print("\n--- Island Optimization Complete ---")
+        merge_islands(islands, islands[0]["problem"].param_names)
+        show_progress(islands, start, ISLANDS_DIR)
+        print(f"Per-island results in {ISLANDS_DIR}/island_<k>/, merged front in {ISLANDS_DIR}/pareto_results_final.csv")
+    finally:
+        manager.shutdown()
+        pool.close()
+        pool.join()
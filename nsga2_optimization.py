@@ -1,32 +1,50 @@
+import hashlib
 import json
 import os
+import re
+import signal
 import subprocess
 import sys
 import pandas as pd
 import numpy as np
+from scipy.spatial import cKDTree
 import multiprocessing
+import time
+import warnings
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
 from functools import partial
+from xml.sax.saxutils import escape
 
-from pymoo.core.problem import ElementwiseProblem
+from pymoo.core.problem import Problem
 from pymoo.algorithms.moo.nsga2 import NSGA2
 from pymoo.optimize import minimize
 from pymoo.operators.sampling.rnd import FloatRandomSampling
 from pymoo.operators.crossover.sbx import SBX
 from pymoo.operators.mutation.pm import PM
 from pymoo.core.callback import Callback
+from pymoo.core.population import Population
+from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
+from pymoo.operators.survival.rank_and_crowding.metrics import calc_crowding_distance
+
+from run_outputs import output_path
+from snapshot_metrics import convert_state_dump, state_meta
 
 # --- XML TEMPLATE CONFIGURATION ---
 # Added {seed} to the template to ensure reproducibility
 EXPERIMENT_XML = """
 <experiments>
   <experiment name="optimization_run" repetitions="1" runMetricsEveryStep="false">
-    <setup>setup</setup>
+    <setup>{setup_commands}</setup>
     <go>go</go>
     <timeLimit steps="{ticks}"/>
     <metric>total-innovation-output</metric>
     <metric>cultural-diversity-index</metric>
     <metric>gini-coefficient</metric>
-    <enumeratedValueSet variable="random-seed">
+    <metric>timer</metric>
+    {extra_metrics}
+    <enumeratedValueSet variable="external-seed">
       <value value="{seed}"/>
     </enumeratedValueSet>
     {enumerated_values}
@@ -35,13 +53,14 @@ EXPERIMENT_XML = """
 """
 
 class CheckpointCallback(Callback):
-    def __init__(self, param_names):
+    def __init__(self, param_names, filename="pareto_results_checkpoint.csv"):
         super().__init__()
         self.param_names = param_names
-        self.filename = "pareto_results_checkpoint.csv"
+        self.filename = filename
         if not os.path.exists(self.filename):
             # Added "Seeds" to the checkpoint columns
-            cols = ["Generation"] + param_names + ["Obj_Innov_Neg", "Obj_Div_Neg", "Obj_Gini"]
+            cols = (["Generation"] + param_names + ["Obj_Innov_Neg", "Obj_Div_Neg", "Obj_Gini", "Fidelity_Ticks"]
+                    + PROVENANCE_COLUMNS)
             pd.DataFrame(columns=cols).to_csv(self.filename, index=False)
             print(f"💾 Checkpoint file created: {self.filename}")
 
@@ -49,40 +68,373 @@ class CheckpointCallback(Callback):
         gen = algorithm.n_gen
         pop = algorithm.pop
         X = pop.get("X")
-        F = pop.get("F")
+        F = pop.get("F").copy()
+        # Placeholders of candidates stopped early are not measurements
+        max_ticks = algorithm.problem.config["MAX_TICKS"]
+        ticks = evaluated_ticks(pop, max_ticks)
+        F[ticks < max_ticks] = np.nan
         df = pd.DataFrame(X, columns=self.param_names)
+        df.insert(0, 'Generation', gen)
         df['Obj_Innov_Neg'] = F[:, 0]
         df['Obj_Div_Neg'] = F[:, 1]
         df['Obj_Gini'] = F[:, 2]
-        df['Generation'] = gen
+        df['Fidelity_Ticks'] = ticks
+        for col, value in result_provenance(algorithm.problem.config).items():
+            df[col] = value
         df.to_csv(self.filename, mode='a', header=False, index=False)
         print(f"✅ Data saved for Generation {gen}")
 
+        # Let the problem close its per-generation bookkeeping
+        if hasattr(algorithm.problem, "end_generation"):
+            algorithm.problem.end_generation(gen)
+
+# --- COMMON RANDOM NUMBERS ---
+# CRN_MODE "generation" gives every candidate of a generation the same seed
+# set, "campaign" the same seed set for the whole run, "off" fresh seeds.
+MAX_SEED = 2147483647
+# Objective value of a candidate whose replicates all failed
+FAILED = 1e10
+
+def crn_seeds(config, generation, n_seeds=None):
+    """Seed of every replicate slot; the first N_REPLICATES do not depend on n_seeds."""
+    mode = config.get("CRN_MODE", "off")
+    n_replicates = n_seeds or config.get("N_REPLICATES", 1)
+    if mode == "campaign":
+        rng = np.random.default_rng(config.get("CRN_SEED", 42))
+    elif mode == "generation":
+        rng = np.random.default_rng([config.get("CRN_SEED", 42), generation])
+    else:
+        return [None] * n_replicates
+    # external-seed must be positive for the model to accept it
+    return [int(s) for s in rng.integers(1, MAX_SEED, size=n_replicates)]
+
+def paired_statistics(replicates):
+    """Paired vs unpaired variance of objective differences between candidates.
+
+    replicates has shape (candidates, replicates, objectives) with NaN for
+    failed runs. Under CRN the paired variance var(A_i - B_i) drops below
+    var(A) + var(B) by twice the covariance the shared seeds induce.
+    """
+    n_cand = replicates.shape[0]
+    if n_cand < 2 or replicates.shape[1] < 2:
+        return None
+    i, j = np.triu_indices(n_cand, k=1)
+    diff = replicates[i] - replicates[j]
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        paired = np.nanmean(np.nanvar(diff, axis=1, ddof=1), axis=0)
+        per_candidate = np.nanvar(replicates, axis=1, ddof=1)
+        unpaired = np.nanmean(per_candidate[i] + per_candidate[j], axis=0)
+    return paired, unpaired
+
+# --- TELEMETRY ---
+# Phases of the attempt currently running in this worker, as (name, start, end)
+_PHASES = []
+
+@contextmanager
+def phase(name):
+    start = time.time()
+    try:
+        yield
+    finally:
+        _PHASES.append((name, start, time.time()))
+
+# --- PROCEDURE PROFILING ---
+@lru_cache(maxsize=None)
+def model_procedures(model_path):
+    """Names of every to/to-report procedure in the model's code tab."""
+    with open(model_path) as f:
+        code = f.read().split("@#$#@#$#@")[0]
+    return tuple(re.findall(r"^to(?:-report)?\s+([^\s\[;]+)", code, flags=re.MULTILINE))
+
+def profile_reporter(config):
+    names = " ".join(f'"{p}"' for p in model_procedures(config["MODEL_PATH"]))
+    return f"profile-summary [{names}]"
+
+def parse_profile(summary):
+    """Splits the profile-summary string into (procedure, calls, inclusive ms, exclusive ms) rows."""
+    rows = []
+    for entry in str(summary).strip('"').split(";"):
+        parts = entry.split(",")
+        if len(parts) == 4:
+            rows.append((parts[0], int(float(parts[1])), float(parts[2]), float(parts[3])))
+    return rows
+
+# --- MEMORY-AWARE SCHEDULING ---
+# Peak resident memory of the attempt currently running in this worker
+_PEAK_RSS_MB = 0.0
+
+def process_tree_rss_mb(root_pid):
+    """Resident memory of a process and all its descendants, via ps (Linux and macOS)."""
+    try:
+        out = subprocess.run(["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True, timeout=10).stdout
+    except Exception:
+        return 0.0
+    children, rss = {}, {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) == 3:
+            pid, ppid, kb = (int(v) for v in parts)
+            children.setdefault(ppid, []).append(pid)
+            rss[pid] = kb
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / 1024
+
+def available_memory_mb():
+    """Memory available for new workers, or None if it cannot be measured here."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def jvm_environment(config):
+    """Environment for headless runs with the configured heap limit.
+
+    _JAVA_OPTIONS is read after the launcher's own -Xmx, so it takes effect
+    even though netlogo-headless.sh hard-codes a heap size.
+    """
+    env = os.environ.copy()
+    heap_mb = config.get("JVM_HEAP_MB")
+    if heap_mb:
+        env["_JAVA_OPTIONS"] = f"{env.get('_JAVA_OPTIONS', '')} -Xmx{int(heap_mb)}m".strip()
+    return env
+
+def run_netlogo_process(cmd, config):
+    """Runs a headless NetLogo process, sampling the peak memory of its process tree."""
+    global _PEAK_RSS_MB
+    timeout = config.get("SIMULATION_TIMEOUT", 300)
+    interval = config.get("MEMORY_SAMPLE_INTERVAL", 1.0)
+    sample = config.get("MEMORY_AWARE", False)
+    # Own session, so a timeout also kills the JVM the launcher script started
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            env=jvm_environment(config), start_new_session=True)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            proc.wait(timeout=interval if sample else max(deadline - time.time(), 0))
+            break
+        except subprocess.TimeoutExpired:
+            if time.time() >= deadline:
+                os.killpg(proc.pid, signal.SIGKILL)
+                proc.wait()
+                raise
+            _PEAK_RSS_MB = max(_PEAK_RSS_MB, process_tree_rss_mb(proc.pid))
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+class MemoryScheduler:
+    """Derives how many simulations may run at once from free memory and cores.
+
+    The per-worker footprint starts at WORKER_MEMORY_MB (or 1.5x the JVM heap)
+    and is replaced by the p95 of measured peaks once a few runs report. The
+    limit is re-evaluated on every supervisor poll: running attempts plus
+    as many new ones as fit into available memory above MEMORY_RESERVE_MB.
+    """
+    def __init__(self, config, n_cpu):
+        self.enabled = config.get("MEMORY_AWARE", False)
+        self.n_cpu = n_cpu
+        self.reserve_mb = config.get("MEMORY_RESERVE_MB", 2048)
+        self.initial_mb = config.get("WORKER_MEMORY_MB") or 1.5 * config.get("JVM_HEAP_MB", 1024)
+        self.peaks = deque(maxlen=config.get("SUPERVISOR_HISTORY", 500))
+        self.generation_limits = []
+
+    def worker_mb(self):
+        if len(self.peaks) < 3:
+            return self.initial_mb
+        return float(np.percentile(self.peaks, 95))
+
+    def observe(self, peak_mb):
+        if peak_mb > 0:
+            self.peaks.append(peak_mb)
+
+    def concurrency(self, in_flight, waiting=0):
+        if not self.enabled:
+            return self.n_cpu
+        available = available_memory_mb()
+        if available is None:
+            return self.n_cpu
+        fits = int((available - self.reserve_mb) // self.worker_mb())
+        limit = max(1, min(self.n_cpu, in_flight + fits))
+        self.generation_limits.append(limit)
+        return limit
+
+    def end_generation(self):
+        """Smallest and largest limits applied since the last call, for the supervisor log."""
+        limits = self.generation_limits or [self.n_cpu]
+        self.generation_limits = []
+        return min(limits), max(limits)
+
+# --- WARM NETLOGO WORKSPACES (SNAPSHOT MODE) ---
+# One headless workspace per worker process, kept open across simulations so
+# JVM start-up and model compilation are paid once per worker.
+_WORKSPACE = None
+
+def get_workspace(config):
+    global _WORKSPACE
+    if _WORKSPACE is None:
+        import pynetlogo
+        netlogo_home = config.get("NETLOGO_HOME", os.path.dirname(config["NETLOGO_PATH"]))
+        heap_mb = config.get("JVM_HEAP_MB")
+        jvmargs = [f"-Xmx{int(heap_mb)}m"] if heap_mb else []
+        with phase("jvm_start"):
+            _WORKSPACE = pynetlogo.NetLogoLink(gui=False, netlogo_home=netlogo_home, jvmargs=jvmargs)
+        with phase("model_compile"):
+            _WORKSPACE.load_model(os.path.abspath(config["MODEL_PATH"]))
+    return _WORKSPACE
+
+def snapshot_path(config, seed):
+    burn_in = config.get("SNAPSHOT_BURN_IN", 0)
+    filename = f"world_seed{seed}_burnin{burn_in}.csv"
+    # NetLogo string literals need forward slashes on every platform
+    return os.path.abspath(os.path.join(config.get("SNAPSHOT_DIR", "snapshots"), filename)).replace(os.sep, "/")
+
+def build_snapshot(config, seed):
+    """Runs setup (plus the optional burn-in) once for a seed and exports the world."""
+    path = snapshot_path(config, seed)
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    link = get_workspace(config)
+    link.command("set headless-mode? true")
+    link.command(f"set external-seed {seed}")
+    # Centre of the bounds for the burn-in; household bridging capital is drawn
+    # per unit weight and scaled by each fork (apply-snapshot-parameters)
+    for key, (lo, hi) in config["PARAM_BOUNDS"].items():
+        link.command(f"set {key} {(lo + hi) / 2}")
+    link.command("set bridging-capital-weight 1")
+    link.command("setup")
+    burn_in = config.get("SNAPSHOT_BURN_IN", 0)
+    if burn_in > 0:
+        link.command(f"repeat {burn_in} [ go ]")
+    link.command(f'save-snapshot "{path}"')
+    return path
+
+def build_snapshots(pool, config, seeds):
+    burn_in = config.get("SNAPSHOT_BURN_IN", 0)
+    print(f"📸 Building {len(seeds)} world snapshots (burn-in: {burn_in} ticks)")
+    if burn_in > 0:
+        # Forks reproduce setup exactly, but the burn-in ran with the centre of the bounds
+        print("⚠️  SNAPSHOT_BURN_IN > 0: forks start from a world shaped by the build parameters, "
+              "not by their own; use 0 for results comparable with fresh runs")
+    pool.map(partial(build_snapshot, config), seeds)
+
+def run_snapshot_simulation(params, config, seed, ticks, profile=False, rng_seed=None):
+    """Forks a stored world: restores it, overrides the optimized globals and runs go.
+
+    Without rng_seed the fork continues the RNG state stored with the
+    snapshot; with one (CRN seeds, fresh-seed retries) the RNG is reseeded
+    after the restore.
+    """
+    try:
+        link = get_workspace(config)
+        with phase("restore"):
+            link.command("set headless-mode? true")
+            link.command(f'restore-snapshot "{snapshot_path(config, seed)}"')
+            if rng_seed is not None:
+                link.command(f"random-seed {rng_seed}")
+        with phase("set_params"):
+            for key, val in params.items():
+                link.command(f"set {key} {val}")
+            link.command("apply-snapshot-parameters")
+            dump_base = state_dump_base(config, f"{seed}_{os.getpid()}_{np.random.randint(1000, 9999)}")
+            if dump_base:
+                for key, val in state_dump_globals(config, dump_base).items():
+                    link.command(f"set {key} {val}")
+                link.command("maybe-dump-agent-state")
+        if profile:
+            link.command("profiler:reset profiler:start")
+        with phase("go"):
+            link.command(f"repeat ({ticks} - ticks) [ go ]")
+        with phase("report"):
+            result = {
+                'innovation': float(link.report('total-innovation-output')),
+                'diversity': float(link.report('cultural-diversity-index')),
+                'gini': float(link.report('gini-coefficient')),
+                'seed': seed if rng_seed is None else rng_seed
+            }
+            if profile:
+                link.command("profiler:stop")
+                result['profile'] = parse_profile(link.report(profile_reporter(config)))
+        convert_dumps(dump_base, params, seed)
+        return result
+    except Exception:
+        return None
+
+# --- AGENT-STATE DUMPS ---
+def state_dump_base(config, tag):
+    """Path prefix of one run's agent-state dumps, or None when STATE_DUMP_TICKS is empty."""
+    if not config.get("STATE_DUMP_TICKS"):
+        return None
+    out_dir = output_path(config, config.get("STATE_DUMP_DIR", "state_dumps"))
+    os.makedirs(out_dir, exist_ok=True)
+    return os.path.abspath(os.path.join(out_dir, f"state_{tag}")).replace(os.sep, "/")
+
+def state_dump_globals(config, dump_base):
+    """NetLogo values of state-dump-ticks and state-dump-file for one run."""
+    ticks = " ".join(str(int(t)) for t in config["STATE_DUMP_TICKS"])
+    return {"state-dump-ticks": f"[{ticks}]", "state-dump-file": f'"{dump_base}.csv"'}
+
+def convert_dumps(dump_base, params, seed):
+    """Splits a finished run's NetLogo dump into one .npz per tick."""
+    if dump_base and os.path.exists(f"{dump_base}.csv"):
+        convert_state_dump(f"{dump_base}.csv", state_meta(params, seed))
+
 # --- PARALLEL SIMULATION HELPER ---
-def run_single_simulation(params, config, replicate_id):
+def run_single_simulation(params, config, replicate_id, seed=None, ticks=None, profile=False):
+    ticks = ticks or config["MAX_TICKS"]
+    if config.get("SNAPSHOT_MODE", False):
+        # Snapshot seeds are already shared by every candidate; an explicit
+        # seed reseeds the fork so retries do not replay the same run
+        seeds = config["SNAPSHOT_SEEDS"]
+        return run_snapshot_simulation(params, config, seeds[replicate_id % len(seeds)], ticks, profile,
+                                       rng_seed=seed)
+
     pid = os.getpid()
     unique_id = f"{pid}_{replicate_id}_{np.random.randint(1000, 9999)}"
     
-    # GENERATING THE RANDOM SEED
-    current_seed = int(np.random.randint(0, 2147483647))
+    # GENERATING THE RANDOM SEED (unless a common seed was assigned)
+    current_seed = int(seed) if seed is not None else int(np.random.randint(1, MAX_SEED))
     
+    dump_base = state_dump_base(config, f"{current_seed}_{unique_id}")
+    netlogo_values = {**params, **state_dump_globals(config, dump_base)} if dump_base else params
+
     param_xml_lines = ""
-    for key, val in params.items():
+    for key, val in netlogo_values.items():
+        val = escape(str(val), {'"': "&quot;"})
         param_xml_lines += f'<enumeratedValueSet variable="{key}"><value value="{val}"/></enumeratedValueSet>\n'
     
     # Passing the seed to the XML content
+    # Profiled runs wrap setup and go with the profiler extension
+    setup_commands = "profiler:reset profiler:start setup reset-timer" if profile else "setup reset-timer"
+    extra_metrics = f"<metric>{profile_reporter(config)}</metric>" if profile else ""
     xml_content = EXPERIMENT_XML.format(
-        ticks=config["MAX_TICKS"],
+        ticks=ticks,
         seed=current_seed,
-        enumerated_values=param_xml_lines
+        enumerated_values=param_xml_lines,
+        setup_commands=setup_commands,
+        extra_metrics=extra_metrics
     )
     
     xml_filename = f"temp_{unique_id}.xml"
     csv_filename = f"temp_{unique_id}.csv"
     
     try:
-        with open(xml_filename, "w") as f:
-            f.write(xml_content)
+        with phase("xml_write"):
+            with open(xml_filename, "w") as f:
+                f.write(xml_content)
 
         cmd = [
             config["NETLOGO_PATH"],
@@ -92,68 +444,842 @@ def run_single_simulation(params, config, replicate_id):
             "--table", csv_filename
         ]
         
-        # 5-minute timeout to prevent hanging
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True, timeout=300)
+        # 5-minute timeout by default to prevent hanging
+        run_start = time.time()
+        run_netlogo_process(cmd, config)
+        run_end = time.time()
         
-        try:
-            df = pd.read_csv(csv_filename, skiprows=6, on_bad_lines='skip')
-        except:
-            return None
+        with phase("csv_parse"):
+            try:
+                df = pd.read_csv(csv_filename, skiprows=6, on_bad_lines='skip')
+            except:
+                return None
 
-        if df.empty: return None
+            if df.empty: return None
 
-        clean_cols = {c: c.replace('"', '').strip() for c in df.columns}
-        df.rename(columns=clean_cols, inplace=True)
-        final_state = df.iloc[-1]
+            clean_cols = {c: c.replace('"', '').strip() for c in df.columns}
+            df.rename(columns=clean_cols, inplace=True)
+            final_state = df.iloc[-1]
+
+        # The timer is reset right after setup, so it measures the go ticks;
+        # the rest of the run is JVM start, model compile and setup
+        go_seconds = min(float(final_state.get('timer', 0)), run_end - run_start)
+        _PHASES.append(("startup_compile_setup", run_start, run_end - go_seconds))
+        _PHASES.append(("go", run_end - go_seconds, run_end))
         
-        return {
+        result = {
             'innovation': float(final_state.get('total-innovation-output', 0)),
             'diversity': float(final_state.get('cultural-diversity-index', 0)),
             'gini': float(final_state.get('gini-coefficient', 0)),
             'seed': current_seed # Returning the seed for tracking
         }
+        if profile:
+            profile_col = next((c for c in df.columns if c.startswith('profile-summary')), None)
+            result['profile'] = parse_profile(final_state[profile_col]) if profile_col else []
+        convert_dumps(dump_base, params, current_seed)
+        return result
     except Exception:
         return None
     finally:
         if os.path.exists(xml_filename): os.remove(xml_filename)
         if os.path.exists(csv_filename): os.remove(csv_filename)
 
-class NetLogoOptimization(ElementwiseProblem):
-    def __init__(self, config, n_threads=4):
+# --- MULTI-FIDELITY (SUCCESSIVE HALVING) ---
+def fidelity_levels(config):
+    """Tick horizons of the halving rungs; the last rung is always MAX_TICKS."""
+    if not config.get("FIDELITY_MODE", False):
+        return [config["MAX_TICKS"]]
+    levels = sorted(t for t in config.get("FIDELITY_TICKS", []) if t < config["MAX_TICKS"])
+    return levels + [config["MAX_TICKS"]]
+
+def rank_order(F):
+    """Indices of F from best to worst by non-dominated rank, then crowding distance."""
+    order = []
+    for front in NonDominatedSorting().do(F):
+        crowding = calc_crowding_distance(F[front])
+        order.extend(front[np.argsort(-crowding, kind="stable")])
+    return np.array(order, dtype=int)
+
+def evaluated_ticks(pop, max_ticks):
+    """Horizon every individual was evaluated at; reused archive objectives count as full."""
+    return np.array([max_ticks if t is None else t for t in pop.get("Fidelity_Ticks")], dtype=float)
+
+def real_front(pop, max_ticks):
+    """Indices of the non-dominated feasible full-horizon individuals of a population.
+
+    Placeholders of candidates stopped early take no part in the sort, so they
+    cannot hide a real result they happen to dominate.
+    """
+    F = pop.get("F")
+    real = np.flatnonzero((evaluated_ticks(pop, max_ticks) >= max_ticks) & (F < FAILED).all(axis=1))
+    if len(real) == 0:
+        return real
+    return real[NonDominatedSorting().do(F[real], only_non_dominated_front=True)]
+
+def full_horizon_front(res, config):
+    """X and F of the real front of the final population."""
+    front = real_front(res.pop, config["MAX_TICKS"])
+    if len(front) == 0:
+        print("⚠️ No full-horizon result in the final population, the saved front is empty")
+    return res.pop.get("X")[front], res.pop.get("F")[front]
+
+def placeholder_offsets(F_low, levels_left):
+    """Distance of candidates stopped early behind the full-horizon results, in spans.
+
+    Low-horizon values are not comparable with full ones, so they only keep
+    their relative order; candidates stopped at earlier rungs land further back.
+    """
+    low_span = np.ptp(F_low, axis=0)
+    low_span[low_span == 0] = 1.0
+    return levels_left + (F_low - F_low.min(axis=0)) / low_span
+
+def demote(offsets, full_min, full_max):
+    """Placeholder objectives beyond full_max, so every full-horizon result dominates them."""
+    span = full_max - full_min
+    span[span == 0] = 1.0
+    return full_max + span * offsets
+
+# --- WARM START FROM ARCHIVED FRONTS ---
+OBJ_COLUMNS = ["Obj_Innov_Neg", "Obj_Div_Neg", "Obj_Gini"]
+# Saved results record what produced them; objectives are only reused from
+# rows of the same model file, horizon and objective definitions
+PROVENANCE_COLUMNS = ["Model_Version", "Max_Ticks", "Objectives"]
+OBJECTIVE_SET = "-innovation,-diversity,gini"
+
+@lru_cache(maxsize=None)
+def model_version(model_path):
+    """Short content hash of the model file."""
+    with open(model_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def result_provenance(config):
+    return {"Model_Version": model_version(config["MODEL_PATH"]), "Max_Ticks": config["MAX_TICKS"],
+            "Objectives": OBJECTIVE_SET}
+
+def matching_provenance(df, config):
+    """Rows produced by the current model file, MAX_TICKS and objective set."""
+    current = result_provenance(config)
+    if not all(c in df.columns for c in current):
+        return np.zeros(len(df), dtype=bool)
+    # Files without provenance leave NaN in the columns of those that have it
+    return ((df["Model_Version"].astype(str) == current["Model_Version"])
+            & (pd.to_numeric(df["Max_Ticks"], errors="coerce") == current["Max_Ticks"])
+            & (df["Objectives"].astype(str) == current["Objectives"])).to_numpy()
+
+def latin_hypercube(n_samples, xl, xu, rng):
+    """One sample per stratum in every dimension, strata paired at random."""
+    n_var = len(xl)
+    strata = np.argsort(rng.random((n_samples, n_var)), axis=0)
+    unit = (strata + rng.random((n_samples, n_var))) / n_samples
+    return xl + unit * (xu - xl)
+
+def warm_start_population(config, problem, n_samples, seed=42):
+    """Initial population seeded from prior result files, topped up with LHS samples.
+
+    Archived points are clipped to the current bounds, deduplicated and, if
+    there are more than WARM_START_FRACTION of the population, the best are
+    kept by rank and crowding. With WARM_START_REUSE_OBJECTIVES the stored
+    objectives of rows whose provenance matches the current model, MAX_TICKS
+    and objective set are kept and pymoo skips evaluating them; every other
+    archived point is re-simulated.
+    """
+    rng = np.random.default_rng(seed)
+    names = problem.param_names
+    archive = pd.concat([pd.read_csv(f, dtype={"Model_Version": str}) for f in config["WARM_START_FILES"]],
+                        ignore_index=True)
+    archive = archive.dropna(subset=names)
+    has_objectives = all(c in archive.columns for c in OBJ_COLUMNS)
+    if has_objectives:
+        # Drop candidates whose replicates all failed
+        archive = archive[(archive[OBJ_COLUMNS].abs() < FAILED).all(axis=1)]
+
+    X = archive[names].to_numpy(dtype=float).clip(problem.xl, problem.xu)
+    _, first = np.unique(X.round(12), axis=0, return_index=True)
+    first = np.sort(first)
+    X = X[first]
+    F = archive[OBJ_COLUMNS].to_numpy(dtype=float)[first] if has_objectives else None
+    compatible = matching_provenance(archive, config)[first]
+
+    n_archive = min(len(X), int(config.get("WARM_START_FRACTION", 1.0) * n_samples))
+    reuse_objectives = config.get("WARM_START_REUSE_OBJECTIVES", False) and F is not None
+    if F is None:
+        order = rng.permutation(len(X))
+    else:
+        # Objectives of other versions are on other scales: rank each group on its own
+        groups = [np.flatnonzero(compatible), np.flatnonzero(~compatible)] if reuse_objectives else [np.arange(len(X))]
+        order = np.concatenate([g[rank_order(F[g])] for g in groups if len(g) > 0])
+    chosen = order[:n_archive]
+
+    reuse = np.zeros(len(chosen), dtype=bool)
+    if reuse_objectives:
+        reuse = compatible[chosen]
+        if not reuse.all():
+            print(f"⚠️ {np.count_nonzero(~reuse)} archived points come from another model version, "
+                  f"MAX_TICKS or objective set; they are re-simulated")
+    warm = Population.new("X", X[chosen[reuse]])
+    if reuse.any():
+        warm.set("F", F[chosen[reuse]])
+        warm.set("G", np.zeros((len(warm), 1)))
+        warm.apply(lambda ind: ind.evaluated.update(["F", "G", "H"]))
+        problem.observe_full(F[chosen[reuse]])
+    resimulated = Population.new("X", X[chosen[~reuse]])
+
+    fill = Population.new("X", latin_hypercube(n_samples - n_archive, problem.xl, problem.xu, rng))
+    print(f"🔥 Warm start: {n_archive} archived points ({len(warm)} objectives reused, {len(resimulated)} re-simulated) "
+          f"+ {len(fill)} LHS samples")
+    return Population.merge(warm, resimulated, fill)
+
+# --- SIMULATION SUPERVISOR ---
+def supervised_simulation(started, attempt_key, args):
+    """Worker entry point: marks when the attempt actually starts, times it and measures its memory."""
+    global _PEAK_RSS_MB
+    del _PHASES[:]
+    _PEAK_RSS_MB = 0.0
+    start = time.time()
+    started[attempt_key] = start
+    result = run_single_simulation(*args)
+    end = time.time()
+    if args[1].get("MEMORY_AWARE", False):
+        # Warm workspaces run the JVM inside this worker, so measure the whole tree
+        _PEAK_RSS_MB = max(_PEAK_RSS_MB, process_tree_rss_mb(os.getpid()))
+    return result, end - start, {"pid": os.getpid(), "start": start, "end": end,
+                                 "phases": list(_PHASES), "peak_rss_mb": _PEAK_RSS_MB}
+
+class SimulationSupervisor:
+    """Runs simulation tasks on a pool, duplicating stragglers and retrying failures.
+
+    Runtimes of successful attempts feed a rolling distribution. An attempt
+    running longer than STRAGGLER_FACTOR times its p95 gets one speculative
+    duplicate with the same seed, and whichever finishes first is kept; the
+    loser keeps its worker, so it counts as in flight until it finishes. A
+    failed attempt is retried with a fresh seed up to MAX_RETRIES times.
+    Attempts are only submitted while the scheduler's concurrency limit
+    allows, so the pool can be sized to the cores while memory sets the pace.
+    """
+    COUNTERS = ["Tasks", "Failures", "Retries", "Stragglers", "Speculative_Wins", "Lost"]
+
+    def __init__(self, config):
+        self.durations = deque(maxlen=config.get("SUPERVISOR_HISTORY", 500))
+        self.straggler_factor = config.get("STRAGGLER_FACTOR", 1.5)
+        self.min_history = config.get("STRAGGLER_MIN_HISTORY", 10)
+        self.max_retries = config.get("MAX_RETRIES", 2)
+        self.poll_interval = config.get("SUPERVISOR_POLL", 0.5)
+        self.log_file = output_path(config, config.get("SUPERVISOR_LOG_FILE", "supervisor_stats.csv"))
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        # Set by runners sharing one manager between problems; they shut it down
+        self.manager = None
+        # Attempts whose task was settled by another attempt but still occupy a worker
+        self.orphans = []
+        self.n_attempts = 0
+        self.telemetry = None
+        self.scheduler = None
+
+    def straggler_threshold(self):
+        if len(self.durations) < self.min_history:
+            return None
+        return self.straggler_factor * np.percentile(self.durations, 95)
+
+    def submit(self, pool, started, task, args, speculative=False):
+        task["queued"] = False
+        self.n_attempts += 1
+        key = self.n_attempts
+        handle = pool.apply_async(supervised_simulation, (started, key, args))
+        task["attempts"].append({"key": key, "handle": handle, "speculative": speculative, "submitted": time.time()})
+
+    def run(self, pool, tasks):
+        if self.manager is not None:
+            return self.supervise(pool, tasks, self.manager.dict())
+        with multiprocessing.Manager() as manager:
+            return self.supervise(pool, tasks, manager.dict())
+
+    def supervise(self, pool, tasks, started):
+        states = [{"args": args, "attempts": [], "retries": 0, "speculated": False, "done": False,
+                   "result": None, "queued": True} for args in tasks]
+        # Tasks wait here until the scheduler admits another attempt
+        waiting = deque(states)
+        self.counts["Tasks"] += len(states)
+
+        while not all(task["done"] for task in states):
+            self.orphans = [attempt for attempt in self.orphans if not attempt["handle"].ready()]
+            in_flight = len(self.orphans) + sum(len(task["attempts"]) for task in states if not task["done"])
+            limit = self.scheduler.concurrency(in_flight, len(waiting)) if self.scheduler is not None else len(states)
+            progress = False
+            while waiting and in_flight < limit:
+                task = waiting.popleft()
+                self.submit(pool, started, task, task["args"])
+                in_flight += 1
+                progress = True
+
+            now = time.time()
+            threshold = self.straggler_threshold()
+            for task in states:
+                if task["done"] or task["queued"]:
+                    continue
+                for attempt in list(task["attempts"]):
+                    if not attempt["handle"].ready():
+                        continue
+                    task["attempts"].remove(attempt)
+                    progress = True
+                    try:
+                        result, duration, info = attempt["handle"].get()
+                    except Exception:
+                        result, duration, info = None, None, None
+                    if self.telemetry is not None:
+                        self.telemetry.record_attempt(attempt["key"], attempt["submitted"], info, task["args"],
+                                                      "ok" if result is not None else "failed")
+                    if info is not None and self.scheduler is not None:
+                        self.scheduler.observe(info.get("peak_rss_mb", 0.0))
+                    if result is not None:
+                        self.durations.append(duration)
+                        task["done"], task["result"] = True, result
+                        # The other attempt runs on until it finishes
+                        self.orphans.extend(task["attempts"])
+                        task["attempts"] = []
+                        if attempt["speculative"]:
+                            self.counts["Speculative_Wins"] += 1
+                        break
+                    self.counts["Failures"] += 1
+
+                if task["done"] or task["attempts"]:
+                    # Still running: duplicate it once if it is far beyond the usual runtime
+                    if (not task["done"] and not task["speculated"] and threshold is not None and in_flight < limit
+                            and any(now - started.get(a["key"], now) > threshold for a in task["attempts"])):
+                        task["speculated"] = True
+                        self.counts["Stragglers"] += 1
+                        self.submit(pool, started, task, task["args"], speculative=True)
+                        in_flight += 1
+                    continue
+
+                if task["retries"] < self.max_retries:
+                    # Fresh seed, so a seed-specific crash is not repeated
+                    task["retries"] += 1
+                    self.counts["Retries"] += 1
+                    args = list(task["args"])
+                    args[3] = int(np.random.randint(1, MAX_SEED))
+                    task["args"] = tuple(args)
+                    task["queued"] = True
+                    waiting.appendleft(task)
+                else:
+                    task["done"] = True
+                    self.counts["Lost"] += 1
+
+            if not progress:
+                # Nothing finished or started: wait for the oldest running attempt
+                running = [a for task in states if not task["done"] for a in task["attempts"]]
+                if running:
+                    min(running, key=lambda a: a["submitted"])["handle"].wait(self.poll_interval)
+                else:
+                    time.sleep(self.poll_interval)
+
+        started.clear()
+        return [task["result"] for task in states]
+
+    def end_generation(self, gen):
+        threshold = self.straggler_threshold()
+        row = {"Generation": gen, **self.counts,
+               "P95_Runtime_s": np.percentile(self.durations, 95) if self.durations else np.nan,
+               "Straggler_Threshold_s": threshold if threshold is not None else np.nan}
+        if self.scheduler is not None:
+            row["Concurrency_Min"], row["Concurrency_Max"] = self.scheduler.end_generation()
+            row["Worker_Memory_MB"] = self.scheduler.worker_mb()
+        write_header = not os.path.exists(self.log_file)
+        pd.DataFrame([row]).to_csv(self.log_file, mode='a', header=write_header, index=False)
+        print(f"🛡️  Supervisor: {self.counts['Failures']} failures, {self.counts['Retries']} retries, "
+              f"{self.counts['Stragglers']} stragglers ({self.counts['Speculative_Wins']} won by duplicates), "
+              f"{self.counts['Lost']} replicates lost")
+        if self.scheduler is not None and self.scheduler.enabled:
+            print(f"🧠 Memory scheduler: {row['Concurrency_Min']}-{row['Concurrency_Max']} concurrent runs, "
+                  f"~{row['Worker_Memory_MB']:.0f} MB per run")
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+
+class Telemetry:
+    """Collects per-attempt phase timings into a Chrome/Perfetto trace and per-generation summary.
+
+    Worker processes become trace processes with one row each. Phases are
+    nested under their replicate span, queue waits are async slices, and
+    pool spin-up and batches appear on the main process row.
+    """
+    PHASE_NAMES = ["xml_write", "startup_compile_setup", "go", "csv_parse",
+                   "jvm_start", "model_compile", "restore", "set_params", "report"]
+
+    def __init__(self, config, n_workers):
+        self.enabled = config.get("TELEMETRY_MODE", False)
+        self.trace_file = output_path(config, config.get("TELEMETRY_TRACE_FILE", "evaluation_trace.json"))
+        self.summary_file = output_path(config, config.get("TELEMETRY_SUMMARY_FILE", "telemetry_summary.csv"))
+        self.n_workers = n_workers
+        self.t0 = time.time()
+        self.main_pid = os.getpid()
+        self.events = [{"name": "process_name", "ph": "M", "pid": self.main_pid, "args": {"name": "optimizer"}}]
+        self.workers = set()
+        self.reset_generation()
+
+    def reset_generation(self):
+        self.generation_start = time.time()
+        self.queue_waits = []
+        self.busy = 0.0
+        self.phase_totals = dict.fromkeys(self.PHASE_NAMES, 0.0)
+        self.pool_spinup = 0.0
+
+    def us(self, t):
+        return int((t - self.t0) * 1e6)
+
+    def span(self, name, start, end, pid=None, args=None):
+        pid = self.main_pid if pid is None else pid
+        self.events.append({"name": name, "ph": "X", "pid": pid, "tid": pid, "ts": self.us(start),
+                            "dur": max(self.us(end) - self.us(start), 1), "args": args or {}})
+
+    def record_pool_spinup(self, start, end):
+        if self.enabled:
+            self.pool_spinup += end - start
+            self.span("pool_spinup", start, end)
+
+    def record_batch(self, start, end, n_tasks, ticks):
+        if self.enabled:
+            self.span(f"batch {ticks} ticks", start, end, args={"tasks": n_tasks})
+
+    def record_attempt(self, key, submitted, info, args, outcome):
+        if not self.enabled or info is None:
+            return
+        pid = info["pid"]
+        if pid not in self.workers:
+            self.workers.add(pid)
+            self.events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"worker {pid}"}})
+        wait = max(info["start"] - submitted, 0.0)
+        self.queue_waits.append(wait)
+        self.busy += info["end"] - info["start"]
+        for ph, t in (("b", submitted), ("e", info["start"])):
+            self.events.append({"name": "queue_wait", "cat": "queue", "ph": ph, "id": key,
+                                "pid": self.main_pid, "tid": self.main_pid, "ts": self.us(t)})
+        self.span("replicate", info["start"], info["end"], pid,
+                  {"replicate": args[2], "seed": args[3], "ticks": args[4], "outcome": outcome})
+        for name, start, end in info["phases"]:
+            self.span(name, start, end, pid)
+            if name in self.phase_totals:
+                self.phase_totals[name] += end - start
+
+    def end_generation(self, gen):
+        if not self.enabled:
+            return
+        wall = time.time() - self.generation_start
+        row = {
+            "Generation": gen,
+            "Wall_s": wall,
+            "Workers": self.n_workers,
+            "Attempts": len(self.queue_waits),
+            "Busy_s": self.busy,
+            "Utilization": self.busy / (self.n_workers * wall) if wall > 0 else np.nan,
+            "Queue_Wait_Mean_s": np.mean(self.queue_waits) if self.queue_waits else np.nan,
+            "Queue_Wait_Max_s": np.max(self.queue_waits) if self.queue_waits else np.nan,
+            "Pool_Spinup_s": self.pool_spinup,
+        }
+        for name in self.PHASE_NAMES:
+            row[f"{name}_s"] = self.phase_totals[name]
+        write_header = not os.path.exists(self.summary_file)
+        pd.DataFrame([row]).to_csv(self.summary_file, mode='a', header=write_header, index=False)
+
+        # Rewritten every generation so an interrupted campaign still leaves a trace
+        with open(self.trace_file, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+        slowest = max(self.phase_totals, key=self.phase_totals.get)
+        print(f"📊 Telemetry: utilization {row['Utilization']:.0%}, mean queue wait {row['Queue_Wait_Mean_s']:.2f}s, "
+              f"dominant phase '{slowest}' ({self.phase_totals[slowest]:.1f}s)")
+        self.reset_generation()
+
+class ProfileAggregator:
+    """Aggregates per-procedure profiles by parameter region across the campaign.
+
+    A region is the bin of every optimized parameter within its bounds, so
+    profiles of runs with e.g. high cultural-diffusion-rate end up together.
+    """
+    def __init__(self, config, param_bounds):
+        self.enabled = config.get("PROFILE_MODE", False)
+        self.fraction = config.get("PROFILE_FRACTION", 0.1)
+        self.n_bins = config.get("PROFILE_BINS", 3)
+        self.runs_file = output_path(config, config.get("PROFILE_RUNS_FILE", "profile_runs.csv"))
+        self.summary_file = output_path(config, config.get("PROFILE_SUMMARY_FILE", "profile_by_region.csv"))
+        self.rng = np.random.default_rng(config.get("PROFILE_SEED", 0))
+        self.param_names = list(param_bounds.keys())
+        self.xl = np.array([param_bounds[k][0] for k in self.param_names])
+        self.xu = np.array([param_bounds[k][1] for k in self.param_names])
+        self.totals = {}
+        self.region_runs = {}
+
+    def sample(self):
+        return self.enabled and self.rng.random() < self.fraction
+
+    def region(self, x):
+        labels = ["low", "mid", "high"] if self.n_bins == 3 else [f"bin{b}" for b in range(self.n_bins)]
+        unit = (np.asarray(x) - self.xl) / np.where(self.xu > self.xl, self.xu - self.xl, 1.0)
+        bins = np.clip((unit * self.n_bins).astype(int), 0, self.n_bins - 1)
+        return "|".join(f"{name}={labels[b]}" for name, b in zip(self.param_names, bins))
+
+    def record(self, generation, x, profile):
+        region = self.region(x)
+        self.region_runs[region] = self.region_runs.get(region, 0) + 1
+        rows = []
+        for procedure, calls, inclusive, exclusive in profile:
+            totals = self.totals.setdefault((region, procedure), [0, 0.0, 0.0])
+            totals[0] += calls
+            totals[1] += inclusive
+            totals[2] += exclusive
+            rows.append([generation, region] + list(x) + [procedure, calls, inclusive, exclusive])
+        write_header = not os.path.exists(self.runs_file)
+        cols = ["Generation", "Region"] + self.param_names + ["Procedure", "Calls", "Inclusive_ms", "Exclusive_ms"]
+        pd.DataFrame(rows, columns=cols).to_csv(self.runs_file, mode='a', header=write_header, index=False)
+
+    def end_generation(self, gen):
+        if not self.totals:
+            return
+        df = pd.DataFrame([(region, procedure, self.region_runs[region], *values)
+                           for (region, procedure), values in self.totals.items()],
+                          columns=["Region", "Procedure", "Runs", "Calls", "Inclusive_ms", "Exclusive_ms"])
+        df["Mean_Exclusive_ms"] = df["Exclusive_ms"] / df["Runs"]
+        df["Exclusive_Share"] = df["Exclusive_ms"] / df.groupby("Region")["Exclusive_ms"].transform("sum")
+        df.sort_values(["Region", "Exclusive_ms"], ascending=[True, False]).to_csv(self.summary_file, index=False)
+
+        overall = df.groupby("Procedure")["Exclusive_ms"].sum().sort_values(ascending=False)
+        share = overall.iloc[0] / overall.sum() if overall.sum() > 0 else 0.0
+        print(f"🔬 Profiled {sum(self.region_runs.values())} runs in {len(self.region_runs)} regions; "
+              f"top procedure '{overall.index[0]}' ({share:.0%} of exclusive time)")
+
+# --- NEAR-DUPLICATE REUSE ---
+class EvaluationArchive:
+    """Evaluated candidates in normalized parameter space with their replicate results, per horizon.
+
+    Offspring landing within REUSE_EPSILON (Chebyshev distance on the unit
+    box) of archived points pool those points' replicates, nearest first.
+    """
+    def __init__(self, xl, xu):
+        self.xl = np.asarray(xl, dtype=float)
+        self.span = np.where(np.asarray(xu) > self.xl, np.asarray(xu) - self.xl, 1.0)
+        self.points = {}
+        self.replicates = {}
+        self.trees = {}
+
+    def normalize(self, x):
+        return (np.asarray(x, dtype=float) - self.xl) / self.span
+
+    def add(self, ticks, x, results):
+        if not results:
+            return
+        self.points.setdefault(ticks, []).append(self.normalize(x))
+        self.replicates.setdefault(ticks, []).append(list(results))
+        # The tree is rebuilt on the next query
+        self.trees.pop(ticks, None)
+
+    def neighbours(self, ticks, x, epsilon, limit):
+        if epsilon <= 0 or not self.points.get(ticks):
+            return []
+        if ticks not in self.trees:
+            self.trees[ticks] = cKDTree(np.array(self.points[ticks]))
+        tree = self.trees[ticks]
+        xn = self.normalize(x)
+        idx = tree.query_ball_point(xn, r=epsilon, p=np.inf)
+        if not idx:
+            return []
+        dist = np.max(np.abs(tree.data[idx] - xn), axis=1)
+        pooled = [r for i in np.array(idx)[np.argsort(dist, kind="stable")] for r in self.replicates[ticks][i]]
+        return pooled[:limit]
+
+class NetLogoOptimization(Problem):
+    def __init__(self, config, n_threads=4, pool=None):
         self.config = config
         self.params = config["PARAM_BOUNDS"]
         self.param_names = list(self.params.keys())
         self.n_replicates = config.get("N_REPLICATES", 1)
         self.n_threads = n_threads
+        # A long-lived pool keeps warm workspaces between evaluations
+        self.pool = pool
+
+        # Generation bookkeeping for common random numbers
+        self.generation = 1
+        self.generation_replicates = []
+        self.n_evaluations = 0
+        self.history_file = output_path(config, config.get("HISTORY_FILE", "evaluation_history.csv"))
+        self.crn_stats_file = output_path(config, config.get("CRN_STATS_FILE", "crn_statistics.csv"))
+        if not os.path.exists(self.history_file):
+            cols = ["Generation", "Evaluation", "Replicate", "Seed", "Ticks"] + self.param_names + ["innovation", "diversity", "gini"]
+            pd.DataFrame(columns=cols).to_csv(self.history_file, index=False)
+
+        # Simulated-tick cost of the current generation
+        self.levels = fidelity_levels(config)
+        self.eta = config.get("FIDELITY_ETA", 3)
+        self.fidelity_log_file = output_path(config, config.get("FIDELITY_LOG_FILE", "fidelity_costs.csv"))
+        self.generation_ticks = 0
+        self.generation_candidates = 0
+        self.generation_promotions = [0] * len(self.levels)
+        # Bounds of every full-horizon result so far; placeholders are kept beyond them
+        self.full_min = None
+        self.full_max = None
+
+        self.supervisor = SimulationSupervisor(config)
+        self.supervisor.scheduler = MemoryScheduler(config, n_threads)
+        self.telemetry = Telemetry(config, n_threads)
+        self.supervisor.telemetry = self.telemetry
+        self.profiler = ProfileAggregator(config, self.params)
         
         xl = [self.params[k][0] for k in self.param_names]
         xu = [self.params[k][1] for k in self.param_names]
-        super().__init__(n_var=len(self.param_names), n_obj=3, xl=xl, xu=xu)
 
-    def _evaluate(self, x, out, *args, **kwargs):
-        param_dict = dict(zip(self.param_names, x))
-        
-        # Parallel execution across replicates
-        with multiprocessing.Pool(self.n_threads) as pool:
-            func = partial(run_single_simulation, param_dict, self.config)
-            results = pool.map(func, range(self.n_replicates))
-        
-        valid_results = [r for r in results if r is not None]
+        # Replicates of near-identical earlier candidates stand in for new runs
+        self.archive = EvaluationArchive(xl, xu)
+        self.reuse_epsilon = config.get("REUSE_EPSILON", 0.0)
+        # More new runs than a full evaluation would make reuse pointless
+        self.reuse_min_new = min(config.get("REUSE_MIN_NEW_REPLICATES", 0), self.n_replicates)
+        self.reuse_log_file = output_path(config, config.get("REUSE_LOG_FILE", "reuse_stats.csv"))
+        self.reuse_counts = dict.fromkeys(["Candidates", "Fully_Reused", "Partially_Reused",
+                                           "Replicates_Reused", "Replicates_Run"], 0)
+        # One constraint marks candidates whose replicates all failed, so they
+        # rank behind every feasible candidate instead of entering the front
+        # requires_kwargs passes the algorithm in, so older placeholders can be re-demoted
+        super().__init__(n_var=len(self.param_names), n_obj=3, n_ieq_constr=1, xl=xl, xu=xu,
+                         requires_kwargs=True)
+
+    def observe_full(self, F):
+        F = F[(F < FAILED).all(axis=1)]
+        if len(F) == 0:
+            return
+        lo, hi = F.min(axis=0), F.max(axis=0)
+        self.full_min = lo if self.full_min is None else np.minimum(self.full_min, lo)
+        self.full_max = hi if self.full_max is None else np.maximum(self.full_max, hi)
+
+    def demote_placeholders(self, offsets):
+        if self.full_max is None:
+            # No full-horizon result yet: rung order on a unit scale
+            return offsets.copy()
+        return demote(offsets, self.full_min, self.full_max)
+
+    def refresh_placeholders(self, pop):
+        """Moves placeholders already in the population behind the current full-horizon bounds."""
+        offsets = [ind.get("Placeholder_Offset") for ind in pop]
+        rows = [i for i, o in enumerate(offsets) if o is not None and not np.isnan(o).any()]
+        if rows:
+            pop[rows].set("F", self.demote_placeholders(np.array([offsets[i] for i in rows])))
+
+    def _evaluate(self, X, out, *args, algorithm=None, **kwargs):
+        self.generation_candidates += len(X)
+        F = np.zeros((len(X), 3))
+        ticks_run = np.full(len(X), float(self.levels[-1]))
+        offsets = np.full((len(X), 3), np.nan)
+        active = np.arange(len(X))
+        stopped = []
+
+        # Every rung keeps the best 1/eta by rank and crowding; the last rung
+        # runs the full horizon and gives the real objectives
+        for rung, ticks in enumerate(self.levels):
+            self.generation_promotions[rung] += len(active)
+            F_rung = self.evaluate_batch(X[active], ticks)
+            if rung == len(self.levels) - 1:
+                F[active] = F_rung
+                break
+            n_keep = max(1, int(np.ceil(len(active) / self.eta)))
+            order = rank_order(F_rung)
+            stopped.append((active[order[n_keep:]], F_rung[order[n_keep:]], len(self.levels) - 1 - rung))
+            ticks_run[active[order[n_keep:]]] = ticks
+            active = active[order[:n_keep]]
+
+        # Placeholders rank behind every full-horizon result of the run, not
+        # only this batch's, and those already in the population are moved
+        # along when the bounds grow
+        self.observe_full(F[active])
+        for idx, F_low, levels_left in stopped:
+            low_ok = ~(F_low >= FAILED).any(axis=1)
+            if low_ok.any():
+                offsets[idx[low_ok]] = placeholder_offsets(F_low[low_ok], levels_left)
+            F[idx[~low_ok]] = FAILED
+        placeholder = ~np.isnan(offsets).any(axis=1)
+        if placeholder.any():
+            F[placeholder] = self.demote_placeholders(offsets[placeholder])
+        if algorithm is not None and algorithm.pop is not None:
+            self.refresh_placeholders(algorithm.pop)
+        out["F"] = F
+        out["G"] = (F >= FAILED).any(axis=1).astype(float)[:, None]
+        # Kept on each individual, so checkpoints and fronts can tell placeholders apart
+        out["Fidelity_Ticks"] = ticks_run
+        out["Placeholder_Offset"] = offsets
+
+    def evaluate_batch(self, X, ticks):
+        """Runs every replicate of every candidate at the given horizon as one pool batch."""
+        # Twice the replicates: pooled and new runs together never need more slots
+        seeds = crn_seeds(self.config, self.generation, 2 * self.n_replicates)
+        reused, owners, slots, tasks = [], [], [], []
+        for i, x in enumerate(X):
+            prior = self.archive.neighbours(ticks, x, self.reuse_epsilon, self.n_replicates)
+            n_new = max(self.reuse_min_new, self.n_replicates - len(prior)) if prior else self.n_replicates
+            self.count_reuse(len(prior), n_new)
+            reused.append(prior)
+            for rep_id in self.replicate_slots(seeds, prior)[:n_new]:
+                owners.append(i)
+                slots.append(rep_id)
+                tasks.append((dict(zip(self.param_names, x)), self.config, rep_id, seeds[rep_id], ticks,
+                              self.profiler.sample()))
+
+        results = []
+        if tasks:
+            batch_start = time.time()
+            if self.pool is not None:
+                results = self.supervisor.run(self.pool, tasks)
+            else:
+                with multiprocessing.Pool(self.n_threads) as pool:
+                    self.telemetry.record_pool_spinup(batch_start, time.time())
+                    results = self.supervisor.run(pool, tasks)
+            self.telemetry.record_batch(batch_start, time.time(), len(tasks), ticks)
+            self.generation_ticks += ticks * len(tasks)
+
+        new_results = [[] for _ in X]
+        new_slots = [[] for _ in X]
+        for i, rep_id, r in zip(owners, slots, results):
+            new_results[i].append(r)
+            new_slots[i].append(rep_id)
+        return np.array([self.aggregate(x, new_results[i], ticks, new_slots[i], seeds, reused[i])
+                         for i, x in enumerate(X)])
+
+    @staticmethod
+    def replicate_slots(seeds, prior):
+        """Replicate slots for new runs, skipping those the pooled replicates already used.
+
+        Under CRN a slot is free when its seed is not among the pooled runs'
+        seeds; without CRN the new runs continue after the pooled ones.
+        """
+        used = {r.get('seed') for r in prior}
+        return [k for k, s in enumerate(seeds) if (s not in used if s is not None else k >= len(prior))]
+
+    def count_reuse(self, n_reused, n_new):
+        self.reuse_counts["Candidates"] += 1
+        self.reuse_counts["Replicates_Reused"] += n_reused
+        self.reuse_counts["Replicates_Run"] += n_new
+        if n_reused > 0:
+            self.reuse_counts["Fully_Reused" if n_new == 0 else "Partially_Reused"] += 1
+
+    def aggregate(self, x, results, ticks, slots, seeds, reused=()):
+        self.record_replicates(x, results, ticks, slots, seeds, reused)
+        new_valid = [r for r in results if r is not None]
+        for r in new_valid:
+            if r.get('profile'):
+                self.profiler.record(self.generation, x, r['profile'])
+        self.archive.add(ticks, x, new_valid)
+        valid_results = new_valid + list(reused)
         
         if not valid_results:
-            out["F"] = [1e10, 1e10, 1e10]
-            return
+            return [FAILED, FAILED, FAILED]
 
         df_res = pd.DataFrame(valid_results)
         avg_innov = df_res['innovation'].mean()
         avg_div = df_res['diversity'].mean()
         avg_gini = df_res['gini'].mean()
 
-        # Save specific seeds used in this evaluation if needed
-        # (History can be added here)
+        if self.config.get("VERBOSE_EVALUATIONS", True):
+            print(f"   Evaluation ({ticks} ticks): Innovation~{int(avg_innov)} Diversity~{avg_div:.2f} Gini~{avg_gini:.2f}")
+        return [-avg_innov, -avg_div, avg_gini]
+
+    def record_replicates(self, x, results, ticks, slots, seeds, reused=()):
+        """Appends every new replicate to the history and keeps full-horizon ones for the paired statistics.
+
+        Objectives sit in the column of the seed slot that produced them, so
+        candidates are compared seed by seed. Pooled replicates join the slot
+        carrying their seed; without CRN they hold the first slots, as in
+        replicate_slots. Pooled runs of a seed outside this generation's set
+        cannot be paired and are left out.
+        """
+        self.n_evaluations += 1
+        rows = []
+        objectives = np.full((len(seeds), 3), np.nan)
+        for rep_id, r in zip(slots, results):
+            if r is None:
+                continue
+            objectives[rep_id] = [r['innovation'], r['diversity'], r['gini']]
+            rows.append([self.generation, self.n_evaluations, rep_id, r['seed'], ticks] + list(x) + list(objectives[rep_id]))
+        slot_of = {s: k for k, s in enumerate(seeds) if s is not None}
+        for k, r in enumerate(reused):
+            rep_id = slot_of.get(r.get('seed')) if slot_of else k
+            if rep_id is not None and rep_id < len(seeds):
+                objectives[rep_id] = [r['innovation'], r['diversity'], r['gini']]
+        if ticks == self.config["MAX_TICKS"]:
+            self.generation_replicates.append(objectives)
+        if rows:
+            pd.DataFrame(rows).to_csv(self.history_file, mode='a', header=False, index=False)
+
+    def end_generation(self, gen):
+        """Logs the generation's simulated-tick cost and paired variance statistics."""
+        self.log_fidelity_cost(gen)
+        self.supervisor.end_generation(gen)
+        self.log_reuse(gen)
+        self.telemetry.end_generation(gen)
+        self.profiler.end_generation(gen)
+        stats = paired_statistics(np.array(self.generation_replicates)) if self.generation_replicates else None
+        self.generation_replicates = []
+        self.generation = gen + 1
+        if stats is None:
+            return
+
+        paired, unpaired = stats
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reduction = 1.0 - paired / unpaired
+        row = {"Generation": gen, "CRN_Mode": self.config.get("CRN_MODE", "off")}
+        for k, name in enumerate(["Innov", "Div", "Gini"]):
+            row[f"Paired_Var_{name}"] = paired[k]
+            row[f"Unpaired_Var_{name}"] = unpaired[k]
+            row[f"Var_Reduction_{name}"] = reduction[k]
+        write_header = not os.path.exists(self.crn_stats_file)
+        pd.DataFrame([row]).to_csv(self.crn_stats_file, mode='a', header=write_header, index=False)
+        print(f"🎲 Paired variance reduction: Innovation {reduction[0]:.1%} Diversity {reduction[1]:.1%} Gini {reduction[2]:.1%}")
+
+    def log_reuse(self, gen):
+        counts = self.reuse_counts
+        self.reuse_counts = dict.fromkeys(counts, 0)
+        if self.reuse_epsilon <= 0:
+            return
+        total = counts["Replicates_Reused"] + counts["Replicates_Run"]
+        row = {"Generation": gen, "Epsilon": self.reuse_epsilon, **counts,
+               "Reuse_Rate": counts["Replicates_Reused"] / total if total else 0.0}
+        write_header = not os.path.exists(self.reuse_log_file)
+        pd.DataFrame([row]).to_csv(self.reuse_log_file, mode='a', header=write_header, index=False)
+        print(f"♻️  Reuse: {counts['Fully_Reused']} candidates fully and {counts['Partially_Reused']} partially "
+              f"reused, {row['Reuse_Rate']:.0%} of replicates taken from neighbours")
+
+    def log_fidelity_cost(self, gen):
+        # Cost of evaluating the same candidates at the full horizon only
+        full_cost = self.generation_candidates * self.n_replicates * self.config["MAX_TICKS"]
+        row = {
+            "Generation": gen,
+            "Candidates": self.generation_candidates,
+            "Simulated_Ticks": self.generation_ticks,
+            "Full_Horizon_Ticks": full_cost,
+            "Savings": 1.0 - self.generation_ticks / full_cost if full_cost else 0.0
+        }
+        for ticks, n in zip(self.levels, self.generation_promotions):
+            row[f"Evaluated_At_{ticks}"] = n
+        write_header = not os.path.exists(self.fidelity_log_file)
+        pd.DataFrame([row]).to_csv(self.fidelity_log_file, mode='a', header=write_header, index=False)
+        print(f"⏱️  Generation {gen}: {self.generation_ticks} simulated ticks ({row['Savings']:.0%} saved vs full horizon)")
+        self.generation_ticks = 0
+        self.generation_candidates = 0
+        self.generation_promotions = [0] * len(self.levels)
+
+def build_algorithm(config, problem):
+    if config.get("WARM_START_FILES"):
+        sampling = warm_start_population(config, problem, config.get("POP_SIZE", 50), seed=config.get("SEED", 42))
+    else:
+        sampling = FloatRandomSampling()
+
+    return NSGA2(
+        pop_size=config.get("POP_SIZE", 50),
+        n_offsprings=10,
+        sampling=sampling,
+        crossover=SBX(prob=0.9, eta=15),
+        mutation=PM(eta=20),
+        eliminate_duplicates=True
+    )
 
-        out["F"] = [-avg_innov, -avg_div, avg_gini]
-        print(f"   Evaluation: Innovation~{int(avg_innov)} Diversity~{avg_div:.2f} Gini~{avg_gini:.2f}")
+def save_results(X, F, param_names, filename, provenance=None):
+    result_df = pd.DataFrame(X, columns=param_names)
+    result_df['Obj_Innov_Neg'] = F[:, 0]
+    result_df['Obj_Div_Neg'] = F[:, 1]
+    result_df['Obj_Gini'] = F[:, 2]
+    for col, value in (provenance or {}).items():
+        result_df[col] = value
+    result_df.to_csv(filename, index=False)
 
 if __name__ == "__main__":
     multiprocessing.set_start_method('spawn', force=True)
@@ -168,29 +1294,29 @@ if __name__ == "__main__":
     n_cpu = multiprocessing.cpu_count()
     print(f"--- Starting PARALLEL Optimization (CPUs: {n_cpu}) ---")
     
-    problem = NetLogoOptimization(config, n_threads=n_cpu)
-    checkpoint_callback = CheckpointCallback(problem.param_names)
-    
-    algorithm = NSGA2(
-        pop_size=config.get("POP_SIZE", 50),
-        n_offsprings=10,
-        sampling=FloatRandomSampling(),
-        crossover=SBX(prob=0.9, eta=15),
-        mutation=PM(eta=20),
-        eliminate_duplicates=True
-    )
+    pool = None
+    if config.get("SNAPSHOT_MODE", False):
+        # Build each seed's world once; forks restore it in warm workspaces
+        pool = multiprocessing.Pool(n_cpu)
+        seeds = config["SNAPSHOT_SEEDS"]
+        build_snapshots(pool, config, seeds)
+
+    problem = NetLogoOptimization(config, n_threads=n_cpu, pool=pool)
+    checkpoint_callback = CheckpointCallback(problem.param_names, output_path(config, "pareto_results_checkpoint.csv"))
+    algorithm = build_algorithm(config, problem)
 
     res = minimize(problem,
                    algorithm,
                    ('n_gen', config.get("N_GENERATIONS", 50)),
-                   seed=42,
+                   seed=config.get("SEED", 42),
                    callback=checkpoint_callback,
                    verbose=True)
 
     print("\n--- Optimization Complete ---")
-    result_df = pd.DataFrame(res.X, columns=problem.param_names)
-    result_df['Obj_Innov_Neg'] = res.F[:, 0]
-    result_df['Obj_Div_Neg'] = res.F[:, 1]
-    result_df['Obj_Gini'] = res.F[:, 2]
-    result_df.to_csv("pareto_results_final.csv", index=False)
+    save_results(*full_horizon_front(res, config), problem.param_names, output_path(config, "pareto_results_final.csv"),
+                 result_provenance(config))
     print("Final results saved with success.")
+
+    if pool is not None:
+        pool.close()
+        pool.join()
@@ -0,0 +1,663 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import shortest_path
+
+from snapshot_metrics import save_state, state_meta
+
+# Array port of Urban_Innovation_Model_vFinal_english.nlogo for the optimizer.
+# Agents are structure-of-arrays (one array per -own variable), networks are
+# symmetric CSR adjacency matrices rebuilt from an edge list when links die.
+# Procedures keep the model's names; every `ask` becomes one whole-population
+# update, so agents acting in turn within an ask see the state from the start
+# of the ask instead of their predecessors' changes.
+#
+# The port is not wired into the optimizer. diffuse-innovation, the adaptive
+# policies and link rewiring are simplified, and its objective distributions
+# differ from the model's (innovation about 19% lower, diversity about 41%
+# higher), so it must not stand in for NetLogo runs until it reproduces them
+# at every parameter point. check_numpy_kernels.py tests its kernels.
+
+# --- WORLD (interface tab) ---
+MIN_COR, MAX_COR = -16, 16
+WORLD_SIZE = MAX_COR - MIN_COR + 1
+SLIDER_DEFAULTS = {
+    "num-households": 50,
+    "num-firms": 50,
+    "num-institutions": 50,
+    "num-universities": 50,
+}
+
+# Globals the optimizer sets through BehaviorSpace. setup keeps them across
+# clear-all; runs made before it did (results/archive/) had them all 0 at the
+# guards whatever the experiment set, which NUMPY_APPLY_PARAMS false reproduces.
+MODEL_GLOBALS = ["bridging-capital-weight", "cultural-diffusion-rate", "innovation-diffusion-rate",
+                 "policy-effectiveness", "knowledge-spillover-radius", "mutation-prob", "imitation-prob",
+                 "initial-cultures"]
+
+N_SECTORS = 15
+FOCUSES = np.array(["innovation", "equity", "diversity"])
+RESEARCH_FOCUSES = np.array(["basic", "applied", "interdisciplinary"])
+RESEARCH_MULTIPLIER = {"basic": 1.0, "applied": 1.2, "interdisciplinary": 1.1}
+
+
+def model_globals(params, apply_params=True):
+    """Global values after apply-parameter-guards, as setup leaves them."""
+    g = dict.fromkeys(MODEL_GLOBALS, 0.0)
+    if apply_params:
+        g.update({k: float(v) for k, v in params.items() if k in g})
+    for key in ["bridging-capital-weight", "cultural-diffusion-rate", "innovation-diffusion-rate",
+                "policy-effectiveness", "mutation-prob", "imitation-prob"]:
+        g[key] = min(1.0, max(0.0, g[key]))
+    g["initial-cultures"] = max(1.0, g["initial-cultures"])
+    g["max-cultures"] = int(max(2, g["initial-cultures"]))
+    return g
+
+
+# --- GEOMETRY (wrapping world) ---
+def random_cor(rng, n):
+    return rng.uniform(MIN_COR - 0.5, MAX_COR + 0.5, n)
+
+
+def wrapped_delta(a, b):
+    d = np.abs(a - b) % WORLD_SIZE
+    return np.minimum(d, WORLD_SIZE - d)
+
+
+def pairwise_distance(x1, y1, x2, y2):
+    return np.hypot(wrapped_delta(x1[:, None], x2[None, :]), wrapped_delta(y1[:, None], y2[None, :]))
+
+
+def patch_coordinate(c):
+    return ((np.floor(c + 0.5).astype(int) - MIN_COR) % WORLD_SIZE) + MIN_COR
+
+
+# --- NETWORKS ---
+def adjacency(ends, n):
+    """Symmetric CSR matrix of an undirected edge list (duplicates merged)."""
+    if len(ends) == 0:
+        return sparse.csr_matrix((n, n))
+    i, j = ends[:, 0], ends[:, 1]
+    m = sparse.csr_matrix((np.ones(2 * len(ends)), (np.r_[i, j], np.r_[j, i])), shape=(n, n))
+    m.data[:] = 1.0
+    return m
+
+
+def unique_edges(i, j):
+    keep = i != j
+    pairs = np.sort(np.column_stack([i[keep], j[keep]]), axis=1)
+    return np.unique(pairs, axis=0) if len(pairs) else pairs.reshape(0, 2)
+
+
+def small_world_edges(rows, cols, exponent, rng):
+    """nw:generate-small-world (Kleinberg): toroidal lattice plus one long-range link per node."""
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    right = r * cols + (c + 1) % cols
+    down = ((r + 1) % rows) * cols + c
+    node = np.arange(rows * cols)
+    dr = np.abs(r[:, None] - r[None, :])
+    dc = np.abs(c[:, None] - c[None, :])
+    lattice = np.minimum(dr, rows - dr) + np.minimum(dc, cols - dc)
+    weights = np.where(lattice > 0, np.maximum(lattice, 1) ** -exponent, 0.0)
+    far = np.array([rng.choice(len(node), p=w / w.sum()) for w in weights])
+    return unique_edges(np.r_[node, node, node], np.r_[right, down, far])
+
+
+def preferential_attachment_edges(n, min_degree, rng):
+    """nw:generate-preferential-attachment (Barabasi-Albert)."""
+    if n <= min_degree:
+        i, j = np.triu_indices(n, 1)
+        return unique_edges(i, j)
+    degree = np.zeros(n)
+    edges = []
+    for new in range(min_degree, n):
+        if new == min_degree:
+            targets = np.arange(min_degree)
+        else:
+            w = degree[:new]
+            targets = rng.choice(new, size=min_degree, replace=False, p=w / w.sum())
+        edges.extend((new, t) for t in targets)
+        degree[targets] += 1
+        degree[new] += min_degree
+    edges = np.array(edges)
+    return unique_edges(edges[:, 0], edges[:, 1])
+
+
+def closeness_centrality(adj):
+    """nw:closeness-centrality: reachable nodes over the sum of their distances, 0 when isolated."""
+    dist = shortest_path(adj, directed=False, unweighted=True)
+    finite = np.isfinite(dist) & (dist > 0)
+    total = np.where(finite, dist, 0).sum(axis=1)
+    reachable = finite.sum(axis=1)
+    return np.divide(reachable, total, out=np.zeros(len(total)), where=total > 0)
+
+
+# --- SELECTION AND STATISTICS ---
+def weighted_n_of(n, weights, rng, size=None):
+    """weighted-n-of without replacement (Efraimidis-Spirakis keys).
+
+    Agents with zero weight are only drawn, uniformly, once the positive ones
+    run out. With `size` the draw is repeated for `size` independent callers.
+    """
+    shape = (size, len(weights)) if size is not None else len(weights)
+    u = 1.0 - rng.random(shape)
+    positive = weights > 0
+    keys = np.where(positive, np.log(u) / np.where(positive, weights, 1.0), -1e300 * (1.0 + u))
+    if n >= len(weights):
+        return np.broadcast_to(np.arange(len(weights)), shape)
+    return np.argpartition(-keys, n - 1, axis=-1)[..., :n]
+
+
+def sorted_list_quantile(vals, q):
+    if len(vals) == 0:
+        return 0.0
+    return float(np.quantile(vals, q))
+
+
+def gini_coefficient(vals):
+    """gini-of-sorted over the sorted values."""
+    vals = np.sort(vals)
+    n = len(vals)
+    total = vals.sum()
+    if n == 0 or total == 0:
+        return 0.0
+    return 2.0 * np.dot(np.arange(1, n + 1), vals) / (n * total) - (n + 1) / n
+
+
+def normalized_shannon(ids):
+    """cultural-diversity-shannon: entropy over the distinct identities, divided by ln k."""
+    counts = np.unique(ids, return_counts=True)[1]
+    if len(counts) <= 1:
+        return 0.0
+    p = counts / counts.sum()
+    return float(-(p * np.log(p)).sum() / np.log(len(counts)))
+
+
+class NumpyModel:
+    """One run of the model: setup in the constructor, then one go per call."""
+
+    def __init__(self, params, seed, apply_params=True):
+        self.rng = np.random.default_rng(seed)
+        self.g = model_globals(params, apply_params)
+        sliders = {k: int(params.get(k, v)) for k, v in SLIDER_DEFAULTS.items()}
+        self.ticks = 0
+        self.total_innovation_output = 0.0
+        self.gini_coefficient = 0.0
+        self.cultural_diversity_index = 0.0
+        self.effectiveness = np.zeros(3)   # innovation, equity, diversity (FOCUSES order)
+        self.last_levels = np.zeros(3)
+
+        self.setup_patches()
+        self.setup_households(sliders["num-households"])
+        self.setup_firms(sliders["num-firms"])
+        self.setup_institutions(sliders["num-institutions"])
+        self.setup_universities(sliders["num-universities"])
+        self.setup_networks()
+        self.setup_input_output_matrix()
+        self.setup_innovation_potential_index()
+        self.init_firm_innovation_flags()
+
+    # --- SETUP ---
+    def setup_patches(self):
+        rng = self.rng
+        n = WORLD_SIZE * WORLD_SIZE
+        self.housing_cost = rng.uniform(0, 10, n)
+        self.cultural_composition = rng.uniform(0, 1, n)
+
+    def setup_households(self, n):
+        rng, g = self.rng, self.g
+        self.income = rng.normal(50000, 15000, n)
+        self.identity = rng.integers(0, g["max-cultures"], n)
+        self.hh_bridging = rng.uniform(0, g["bridging-capital-weight"], n)
+        self.education = rng.integers(0, 5, n)
+        self.tolerance = rng.uniform(0, 1, n)
+        self.innovation_tendency = rng.uniform(0, 0.1, n)
+        self.mobility = 0.1 + rng.uniform(0, 0.3, n)
+        self.hh_x, self.hh_y = random_cor(rng, n), random_cor(rng, n)
+
+    def setup_firms(self, n):
+        rng = self.rng
+        self.firm_x, self.firm_y = random_cor(rng, n), random_cor(rng, n)
+        self.sector = rng.integers(0, N_SECTORS, n)
+        self.human_capital = np.clip(rng.normal(0.5, 0.2, n), 0, 1)
+        self.firm_bridging = np.clip(rng.normal(0.5, 0.2, n), 0, 1)
+        self.cultural_diversity = rng.uniform(0, 1, n)
+        self.rd_budget = np.clip(np.maximum(100, rng.normal(50000, 20000, n)), 0, 1e9)
+        self.output = np.zeros(n)
+        self.centrality = np.zeros(n)
+        self.production_efficiency = np.ones(n)
+        self.subsidy = np.zeros(n)
+        self.learning_curve = np.ones(n)
+        self.absorption = 0.5 + rng.uniform(0, 0.5, n)
+        self.potential = (0.4 * self.human_capital + 0.3 * self.cultural_diversity +
+                          0.2 * self.firm_bridging + 0.1 * rng.uniform(0, 1, n))
+
+    def setup_institutions(self, n):
+        rng = self.rng
+        self.policy_budget = np.maximum(0, rng.normal(100000, 20000, n))
+        self.policy_focus = rng.integers(0, 3, n)
+
+    def setup_universities(self, n):
+        rng = self.rng
+        self.uni_x, self.uni_y = random_cor(rng, n), random_cor(rng, n)
+        self.research_budget = np.maximum(0, rng.normal(200000, 50000, n))
+        self.knowledge_stock = rng.integers(0, 100, n).astype(float)
+        self.research_focus = rng.integers(0, 3, n)
+        self.collaboration = rng.uniform(0, 1, n)
+
+    def add_households(self, n):
+        """Households created by the network generator: every variable 0, at the origin."""
+        for name in ["income", "hh_bridging", "tolerance", "innovation_tendency", "mobility", "hh_x", "hh_y"]:
+            setattr(self, name, np.r_[getattr(self, name), np.zeros(n)])
+        self.identity = np.r_[self.identity, np.zeros(n, dtype=int)]
+        self.education = np.r_[self.education, np.zeros(n, dtype=int)]
+
+    def add_firms(self, n):
+        """Firms created by the network generator: every variable 0, at the origin."""
+        for name in ["firm_x", "firm_y", "human_capital", "firm_bridging", "cultural_diversity", "rd_budget",
+                     "output", "centrality", "production_efficiency", "subsidy", "learning_curve", "absorption",
+                     "potential"]:
+            setattr(self, name, np.r_[getattr(self, name), np.zeros(n)])
+        self.sector = np.r_[self.sector, np.zeros(n, dtype=int)]
+
+    def setup_networks(self):
+        rng = self.rng
+        # Like nw:generate-*, the generators add new households and firms
+        n_hh = len(self.income)
+        grid = int(np.floor(np.sqrt(n_hh) + 0.5))
+        self.social_edges = np.empty((0, 2), dtype=int)
+        if n_hh > 1:
+            self.add_households(grid * grid)
+            self.social_edges = small_world_edges(grid, grid, 2.0, rng) + n_hh
+        self.bridge_edges = np.empty((0, 2), dtype=int)
+
+        n_f = len(self.output)
+        self.economic_edges = np.empty((0, 2), dtype=int)
+        if n_f > 1:
+            self.add_firms(n_f)
+            self.economic_edges = preferential_attachment_edges(n_f, 2, rng) + n_f
+        self.economic = adjacency(self.economic_edges, len(self.output))
+
+        # University knowledge links, counted per firm
+        self.university_links = np.zeros(len(self.output))
+        potential = np.where(self.firm_bridging > 0.5)[0]
+        if len(potential):
+            for ci in self.collaboration:
+                picked = weighted_n_of(1 + int(np.floor(ci * 5)), self.firm_bridging[potential], rng)
+                self.university_links[potential[picked]] += 1
+
+        # Firms never move: firms in-radius 5 and knowledge-spillover-radius are fixed
+        firm_dist = pairwise_distance(self.firm_x, self.firm_y, self.firm_x, self.firm_y)
+        np.fill_diagonal(firm_dist, np.inf)
+        self.nearby_firms = (firm_dist <= 5).sum(axis=1)
+        radius = self.g["knowledge-spillover-radius"]
+        self.spillover_neighbors = sparse.csr_matrix((firm_dist <= radius).astype(float))
+        self.university_reach = sparse.csr_matrix(
+            (pairwise_distance(self.uni_x, self.uni_y, self.firm_x, self.firm_y) <= radius).astype(float))
+
+    def setup_input_output_matrix(self):
+        a_matrix = np.full((N_SECTORS, N_SECTORS), 0.1)
+        self.base_sector_output = np.linalg.inv(np.eye(N_SECTORS) - a_matrix) @ np.full(N_SECTORS, 100.0)
+
+    def setup_innovation_potential_index(self):
+        threshold = sorted_list_quantile(self.potential, 0.60)
+        self.link_eligible = self.potential > threshold
+        self.spatial_eligible = self.potential > threshold - 0.05
+
+    def init_firm_innovation_flags(self):
+        n = len(self.output)
+        self.innovator = np.zeros(n, dtype=bool)
+        self.innovation_score = np.zeros(n)
+        if n == 0:
+            return
+        modifier = max(0.05, 1 - self.g["initial-cultures"] / 40)
+        n_innovators = max(2, int(np.floor(0.025 * modifier * n + 0.5)))
+        candidates = np.where(self.potential >= sorted_list_quantile(self.potential, 0.75))[0]
+        if len(candidates) < n_innovators:
+            candidates = np.where(self.potential >= sorted_list_quantile(self.potential, 0.50))[0]
+        if len(candidates) < n_innovators:
+            candidates = np.arange(n)
+        picked = self.rng.choice(candidates, size=min(n_innovators, len(candidates)), replace=False)
+        self.innovator[picked] = True
+        self.innovation_score[picked] = self.potential[picked] * self.absorption[picked] * 100 + \
+            self.rng.uniform(0, 5, len(picked))
+
+    # --- GO ---
+    def go(self):
+        self.cultural_mutation_step()
+        self.cultural_imitation_step()
+        self.update_diversity()
+
+        self.update_households()
+        # go asks every firm, institution and university to run a procedure
+        # that itself asks all of them, so each runs once per member per tick
+        if self.ticks % 20 == 0 and len(self.output) > 1:
+            self.centrality = closeness_centrality(self.economic)
+        for _ in range(len(self.output)):
+            self.update_firms()
+        for _ in range(len(self.policy_budget)):
+            self.implement_adaptive_policies()
+        for _ in range(len(self.research_budget)):
+            self.conduct_research()
+
+        self.diffuse_innovation()
+        self.maybe_create_bridging_link()
+        self.update_networks()
+        self.update_economy()
+        self.calculate_metrics()
+        if self.ticks % 10 == 0:
+            self.update_policy_effectiveness()
+        self.ticks += 1
+
+    def cultural_mutation_step(self):
+        p = self.g["mutation-prob"]
+        if p <= 0:
+            return
+        rng, m = self.rng, self.g["max-cultures"]
+        jump = 0.8 if self.cultural_diversity_index < 0.15 else 0.5 if self.cultural_diversity_index < 0.3 else 0.2
+        n = len(self.identity)
+        mutating = rng.random(n) < p
+        local = rng.random(n) < 1 - jump
+        stepped = self.identity + rng.choice([-1, 1], n)
+        ok = mutating & local & (stepped >= 0) & (stepped < m)
+        jumping = mutating & ~local
+        self.identity = np.where(ok, stepped, np.where(jumping, rng.integers(0, m, n), self.identity))
+
+    def cultural_imitation_step(self):
+        p = self.g["imitation-prob"]
+        if p <= 0:
+            return
+        rng = self.rng
+        imitating = np.where(rng.random(len(self.identity)) < p)[0]
+        if len(imitating) == 0:
+            return
+        near = pairwise_distance(self.hh_x[imitating], self.hh_y[imitating], self.hh_x, self.hh_y) <= 3
+        near[np.arange(len(imitating)), imitating] = False
+        bridging = self.hh_bridging[None, :]
+        # max-one-of random-float bridging-capital; uniform when no neighbour has any
+        uniform = (np.where(near, bridging, 0).sum(axis=1) <= 0)[:, None]
+        score = rng.random(near.shape) * np.where(uniform, 1.0, np.maximum(1e-9, bridging))
+        score = np.where(near, score, -1.0)
+        has = near.any(axis=1)
+        influencer = score.argmax(axis=1)
+        self.identity[imitating[has]] = self.identity[influencer[has]]
+
+    def update_diversity(self):
+        shannon = normalized_shannon(self.identity)
+        max_div = np.log(max(2, self.g["initial-cultures"]))
+        diffusion_factor = min(1.2, 0.5 + self.g["cultural-diffusion-rate"])
+        self.cultural_diversity_index = shannon / max_div * diffusion_factor
+
+    def update_households(self):
+        rng, g = self.rng, self.g
+        n = len(self.income)
+        m = g["max-cultures"]
+
+        # Relocation to the cheapest affordable patch; every cost term but
+        # distance is > -0.1, so a patch within radius 2 costing <= 1.9 is optimal
+        movers = np.where(rng.random(n) < self.mobility)[0]
+        if len(movers):
+            px, py = patch_coordinate(self.hh_x[movers]), patch_coordinate(self.hh_y[movers])
+            off = np.arange(-2, 3)
+            cx = ((px[:, None, None] + off[None, :, None] - MIN_COR) % WORLD_SIZE) + MIN_COR
+            cy = ((py[:, None, None] + off[None, None, :] - MIN_COR) % WORLD_SIZE) + MIN_COR
+            cx, cy = cx.reshape(len(movers), -1), cy.reshape(len(movers), -1)
+            dist = np.hypot(wrapped_delta(cx, self.hh_x[movers, None]), wrapped_delta(cy, self.hh_y[movers, None]))
+            cost, ok = self.relocation_cost(movers, (cy - MIN_COR) * WORLD_SIZE + (cx - MIN_COR), dist)
+            ok &= dist <= 2
+            cost = np.where(ok, cost, np.inf)
+            best = cost.argmin(axis=1)
+            local = cost[np.arange(len(movers)), best] <= 1.9
+            self.hh_x[movers[local]] = cx[local, best[local]]
+            self.hh_y[movers[local]] = cy[local, best[local]]
+            far = movers[~local]
+            if len(far):
+                idx = np.broadcast_to(np.arange(WORLD_SIZE * WORLD_SIZE), (len(far), WORLD_SIZE * WORLD_SIZE))
+                ax, ay = idx % WORLD_SIZE + MIN_COR, idx // WORLD_SIZE + MIN_COR
+                dist = np.hypot(wrapped_delta(ax, self.hh_x[far, None]), wrapped_delta(ay, self.hh_y[far, None]))
+                cost, ok = self.relocation_cost(far, idx, dist)
+                cost = np.where(ok, cost, np.inf)
+                best = cost.argmin(axis=1)
+                moved = ok.any(axis=1)
+                self.hh_x[far[moved]] = ax[moved, best[moved]]
+                self.hh_y[far[moved]] = ay[moved, best[moved]]
+
+        # Influence of nearby high-bridging households with a close identity
+        influenced = np.where(rng.random(n) < g["cultural-diffusion-rate"])[0]
+        if len(influenced):
+            near = pairwise_distance(self.hh_x[influenced], self.hh_y[influenced], self.hh_x, self.hh_y) <= 3
+            near[np.arange(len(influenced)), influenced] = False
+            cdist = np.abs(self.identity[influenced, None] - self.identity[None, :]) / max(1, m)
+            candidate = near & (self.hh_bridging[None, :] > 0.5) & (cdist < 0.3)
+            weight = np.where(candidate, self.hh_bridging[None, :] * (1 - cdist), 0.0)
+            total = weight.sum(axis=1)
+            # Candidates have bridging-capital > 0.5 and distance < 0.3, so every weight is positive
+            draw = rng.random(len(influenced)) * total
+            pick = (np.cumsum(weight, axis=1) > draw[:, None]).argmax(axis=1)
+            strength = self.hh_bridging[pick] * (1 - cdist[np.arange(len(influenced)), pick])
+            adopt = candidate.any(axis=1) & (strength > 0.3)
+            self.identity[influenced[adopt]] = self.identity[pick[adopt]]
+
+        innovating = rng.random(n) < self.innovation_tendency
+        self.identity = np.where(innovating, rng.integers(0, m, n), self.identity)
+        self.innovation_tendency = np.where(innovating, self.innovation_tendency * 0.9, self.innovation_tendency)
+
+        learning = (rng.random(n) < 0.01) & (self.education < 4)
+        self.education = self.education + learning
+        self.income = np.where(learning, self.income * (1 + rng.uniform(0, 0.1, n)), self.income)
+
+    def relocation_cost(self, hh, patch_idx, dist):
+        """relocation-cost of the patches in patch_idx (one row per household) and their affordability."""
+        m = self.g["max-cultures"]
+        income = self.income[hh, None]
+        cost = self.housing_cost[patch_idx]
+        composition = self.cultural_composition[patch_idx]
+        cdist = np.abs(self.identity[hh, None] - np.floor(composition * m)) / max(1, m)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total = dist + cost / income - composition / 10 + 0.5 * cdist
+        return total, cost < income * 0.3
+
+    def update_firms(self):
+        # Structural access: institution links are never created, university links weigh 0.8
+        structural_access = 0.4 * self.firm_bridging + 0.3 * self.centrality + 0.3 * (self.university_links * 0.8)
+        knowledge_pool = self.economic @ np.log(1 + self.output)
+        external_knowledge = structural_access * (1 + knowledge_pool / 10)
+
+        norm_rd = np.log(np.maximum(2.718, self.rd_budget))
+        norm_hc = np.maximum(0.01, self.human_capital)
+        norm_cd = np.maximum(0.01, self.cultural_diversity)
+        norm_ek = np.maximum(0.01, external_knowledge)
+
+        subsidy_ratio = np.clip(np.divide(self.subsidy, self.rd_budget, out=np.zeros(len(self.subsidy)),
+                                          where=self.rd_budget != 0), 0, 2)
+        a_i = 0.15 * (1 + 0.2 * subsidy_ratio) * (1 + 0.05 * self.nearby_firms) * self.learning_curve
+        latent = a_i * norm_rd ** 0.25 * norm_hc ** 0.30 * norm_cd ** 0.35 * norm_ek ** 0.10
+        net_intensity = latent / (1 + 0.5 * self.cultural_diversity ** 2)
+
+        delta = self.rng.poisson(net_intensity * 5)
+        self.output = self.output + delta
+        self.innovation_score = self.innovation_score + delta / 100
+        self.learning_curve = np.minimum(2.0, 1 + np.log(1 + self.output) / 20)
+
+    def implement_adaptive_policies(self):
+        rng = self.rng
+        n = len(self.policy_budget)
+        switching = rng.random(n) < 0.1
+        # Ties keep the earlier focus in innovation, diversity, equity order
+        order = [0, 2, 1]
+        best = order[int(np.argmax(self.effectiveness[order]))]
+        self.policy_focus = np.where(switching, best, self.policy_focus)
+
+        funded = self.policy_budget > 0
+        innovation = np.where((self.policy_focus == 0) & funded)[0]
+        if len(innovation) and len(self.output):
+            n_target = max(1, len(self.output) // 5)
+            targets = weighted_n_of(n_target, self.output, rng, size=len(innovation))
+            amount = np.minimum(5000, self.policy_budget[innovation] / (targets.shape[1] + 1))
+            received = np.zeros(len(self.output))
+            np.add.at(received, targets, np.repeat(amount, targets.shape[1]).reshape(targets.shape))
+            self.grant(received)
+            self.policy_budget[innovation] -= amount * targets.shape[1]
+
+        diversity = np.where(self.policy_focus == 2)[0]
+        target_firms = (self.cultural_diversity > 0.6) & (self.output > 0)
+        k = target_firms.sum()
+        diversity = diversity[self.policy_budget[diversity] > 0]
+        if k and len(diversity):
+            amount = np.minimum(3000, self.policy_budget[diversity] / (k + 1))
+            self.grant(target_firms * amount.sum())
+            self.policy_budget[diversity] -= amount * k
+
+        # Assistance lifts households over the threshold, so equity institutions act in turn
+        for i in np.where((self.policy_focus == 1) & (self.policy_budget > 0))[0]:
+            poor = self.income < 40000
+            k = poor.sum()
+            if k == 0:
+                break
+            amount = min(2000, self.policy_budget[i] / (k + 1))
+            self.income = self.income + poor * amount
+            educated = poor & (rng.random(len(poor)) < 0.3)
+            self.education = np.where(educated, np.minimum(4, self.education + 1), self.education)
+            self.policy_budget[i] -= amount * k
+
+        if self.ticks % 50 == 0:
+            low = self.policy_budget < 10000
+            self.policy_budget[low] += rng.normal(50000, 10000, low.sum())
+
+    def grant(self, amount):
+        self.rd_budget = np.clip(self.rd_budget + amount, 0, 1e9)
+        self.subsidy = self.subsidy + amount
+
+    def conduct_research(self):
+        rng = self.rng
+        n = len(self.research_budget)
+        multiplier = np.array([RESEARCH_MULTIPLIER[f] for f in RESEARCH_FOCUSES])[self.research_focus]
+        research_output = self.research_budget * 0.01 * rng.random(n) * multiplier
+        self.knowledge_stock += research_output
+        self.output = self.output + self.university_reach.T @ (research_output * 0.5 * self.collaboration)
+        if (self.output > 100).sum() > len(self.output) / 3:
+            applied = rng.random(n) < 0.05
+            self.research_focus = np.where(applied, 1, self.research_focus)
+
+    def diffuse_innovation(self):
+        if len(self.output) < 2:
+            return
+        rng, g = self.rng, self.g
+        econ_p = 0.02 + g["innovation-diffusion-rate"] * 0.25
+        spatial_p = 0.01 + g["bridging-capital-weight"] * 0.015
+        active = self.innovator.astype(float)
+        # Every innovator neighbour gives an eligible non-adopter one chance
+        link_k = self.economic @ active
+        spatial_k = self.spillover_neighbors @ active
+        open_ = ~self.innovator
+        by_link = open_ & self.link_eligible & (rng.random(len(active)) < 1 - (1 - econ_p) ** link_k)
+        by_space = open_ & ~by_link & self.spatial_eligible & \
+            (rng.random(len(active)) < 1 - (1 - spatial_p) ** spatial_k)
+        adopted = by_link | by_space
+        self.innovation_score = np.where(self.innovator, self.innovation_score * 0.995, self.innovation_score)
+        self.innovation_score += by_link * rng.uniform(0, 4, len(active)) + by_space * rng.uniform(0, 2, len(active))
+        self.innovator |= adopted
+
+    def maybe_create_bridging_link(self):
+        rng = self.rng
+        n = len(self.identity)
+        if n < 2:
+            return
+        p = min(0.05, 0.005 + self.g["bridging-capital-weight"] * 0.01)
+        if rng.random() >= p:
+            return
+        src = rng.integers(n)
+        candidates = np.where(np.abs(self.identity - self.identity[src]) > 2)[0]
+        linked = set(self.bridge_edges[(self.bridge_edges == src).any(axis=1)].ravel()) | \
+            set(self.social_edges[(self.social_edges == src).any(axis=1)].ravel())
+        candidates = np.array([c for c in candidates if c not in linked])
+        if len(candidates):
+            self.bridge_edges = unique_edges(np.r_[self.bridge_edges[:, 0], src],
+                                             np.r_[self.bridge_edges[:, 1], rng.choice(candidates)])
+
+    def update_networks(self):
+        rng = self.rng
+        # Social rewiring: the link dies, and with it the replacement code
+        survive = rng.random(len(self.social_edges)) >= 0.1
+        self.social_edges = self.social_edges[survive]
+
+        if self.ticks % 20 == 0:
+            out = self.output
+            if len(self.economic_edges):
+                avg = out[self.economic_edges].mean(axis=1)
+                dies = (rng.random(len(avg)) < 0.05) & (avg < out.mean())
+                if dies.any():
+                    self.economic_edges = self.economic_edges[~dies]
+                    self.economic = adjacency(self.economic_edges, len(out))
+            if len(out) > 1:
+                self.centrality = closeness_centrality(self.economic)
+
+    def update_economy(self):
+        multiplier = 1 + self.total_innovation_output / 10000
+        sector_output = self.base_sector_output[self.sector] * multiplier
+        self.output = self.output + sector_output / 100 * self.production_efficiency
+
+    def calculate_metrics(self):
+        self.total_innovation_output = float(self.output.sum())
+        self.gini_coefficient = gini_coefficient(self.income)
+        self.update_diversity()
+
+    def agent_state(self):
+        """Arrays of dump-agent-state, indexed like the model's agents."""
+        idx = np.arange(WORLD_SIZE * WORLD_SIZE)
+        return {
+            "tick": self.ticks,
+            "world": np.array([MIN_COR, MAX_COR, MIN_COR, MAX_COR]),
+            "max_cultures": self.g["max-cultures"],
+            "spillover_radius": self.g["knowledge-spillover-radius"],
+            "patch_x": idx % WORLD_SIZE + MIN_COR,
+            "patch_y": idx // WORLD_SIZE + MIN_COR,
+            "housing_cost": self.housing_cost,
+            "household_x": self.hh_x,
+            "household_y": self.hh_y,
+            "household_identity": self.identity,
+            "household_income": self.income,
+            "firm_x": self.firm_x,
+            "firm_y": self.firm_y,
+            "firm_output": self.output,
+            "social_links": self.social_edges,
+            "economic_links": self.economic_edges,
+        }
+
+    def update_policy_effectiveness(self):
+        current = np.array([self.total_innovation_output, 1 - self.gini_coefficient, self.cultural_diversity_index])
+        previous = self.last_levels
+        update = previous > 0
+        self.effectiveness[update] = (current[update] - previous[update]) / previous[update]
+        self.last_levels = current
+
+
+def run_numpy_simulation(params, config, seed, ticks, dump_base=None):
+    """Drop-in for a NetLogo replicate, returning the objectives after `ticks` ticks.
+
+    The ln in update-firm-enhanced stops a NetLogo run once a firm's output
+    falls to -1, and BehaviorSpace then reports the metrics as they stand.
+    The same math error ends the run here with the same metrics. With
+    dump_base the agent state at the STATE_DUMP_TICKS is saved as
+    <dump_base>_t<tick>.npz.
+    """
+    dump_ticks = set(config.get("STATE_DUMP_TICKS", [])) if dump_base else set()
+
+    def maybe_dump(model):
+        if model.ticks in dump_ticks:
+            save_state(f"{dump_base}_t{model.ticks}.npz", {**model.agent_state(), **state_meta(params, seed)})
+
+    with np.errstate(invalid="raise", divide="raise"):
+        model = NumpyModel(params, seed, config.get("NUMPY_APPLY_PARAMS", True))
+        maybe_dump(model)
+        try:
+            for _ in range(ticks):
+                model.go()
+                maybe_dump(model)
+        except FloatingPointError:
+            pass
+    return {
+        'innovation': model.total_innovation_output,
+        'diversity': float(model.cultural_diversity_index),
+        'gini': float(model.gini_coefficient),
+        'seed': seed
+    }
@@ -0,0 +1,276 @@
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+
+from run_outputs import output_file
+
+# Incremental runner for the optimizer and everything downstream of it. Each
+# stage declares its input and output files; a stage depends on the stages
+# whose outputs it reads. A stage is skipped when its command, the content
+# hashes of its inputs and those of its outputs match the last successful
+# run recorded in pipeline_state.json. Ready stages run side by side, and
+# every stage's output goes to pipeline_logs/<stage>.log. Before a stage
+# runs, its previous outputs (and the logs the optimizer appends to) move to
+# pipeline_previous/<stage>/, so a rerun never appends to an old run's rows.
+#
+# Usage: python3 pipeline.py nsga2_config_final.json [--force] [--skip stage ...]
+
+STATE_FILE = "pipeline_state.json"
+LOG_DIR = "pipeline_logs"
+TIMINGS_FILE = "pipeline_timings.csv"
+PREVIOUS_DIR = "pipeline_previous"
+# Per-generation logs the optimizer appends to, with their default names
+OPTIMIZER_LOGS = {
+    "CRN_STATS_FILE": "crn_statistics.csv",
+    "FIDELITY_LOG_FILE": "fidelity_costs.csv",
+    "REUSE_LOG_FILE": "reuse_stats.csv",
+    "SUPERVISOR_LOG_FILE": "supervisor_stats.csv",
+    "TELEMETRY_TRACE_FILE": "evaluation_trace.json",
+    "TELEMETRY_SUMMARY_FILE": "telemetry_summary.csv",
+    "PROFILE_RUNS_FILE": "profile_runs.csv",
+    "PROFILE_SUMMARY_FILE": "profile_by_region.csv",
+}
+PYTHON = sys.executable or "python3"
+
+
+def build_stages(config_file, config):
+    """Pipeline DAG: name -> command, input files (globs allowed), output files and appended logs."""
+    front = output_file(config, "pareto_results_final.csv")
+    history = output_file(config, config.get("HISTORY_FILE", "evaluation_history.csv"))
+    optimizer_outputs = [front, output_file(config, "pareto_results_checkpoint.csv"), history]
+    dumps = os.path.join(output_file(config, config.get("STATE_DUMP_DIR", "state_dumps")), "*.npz")
+    if config.get("STATE_DUMP_TICKS"):
+        optimizer_outputs.append(dumps)
+
+    stages = {
+        "optimize": {
+            "cmd": [PYTHON, "nsga2_optimization.py", config_file],
+            "inputs": [config_file, config["MODEL_PATH"], "nsga2_optimization.py", "snapshot_metrics.py"],
+            "outputs": optimizer_outputs,
+            "logs": [output_file(config, config.get(key, name)) for key, name in OPTIMIZER_LOGS.items()],
+        },
+    }
+    if os.path.normpath(front) != "pareto_results_final.csv":
+        # The analysis scripts read the front from the working directory
+        stages["publish_front"] = {
+            "cmd": ["cp", front, "pareto_results_final.csv"],
+            "inputs": [front],
+            "outputs": ["pareto_results_final.csv"],
+        }
+    stages.update({
+        "knee_point": {
+            "cmd": [PYTHON, "find_knee_point.py"],
+            "inputs": ["find_knee_point.py", "pareto_results_final.csv"],
+            "outputs": ["knee_point_solution.csv", "thesis_plots/Fig6_Knee_Point.png"],
+        },
+        "compare_results": {
+            "cmd": [PYTHON, "analysis/compare_results.py"],
+            "inputs": ["analysis/compare_results.py", "pareto_results_final.csv"],
+            "outputs": [],
+        },
+        "thesis_analysis": {
+            "cmd": [PYTHON, "analysis/thesis_analysis.py"],
+            "inputs": ["analysis/thesis_analysis.py", "analysis/streaming_analytics.py", "pareto_results_final.csv"],
+            "outputs": ["pareto_results_analyzed.csv", "Fig1_Pareto_Front_Overview.png",
+                        "Fig2_Correlation_Heatmap.png"],
+        },
+        "bridging_figures": {
+            "cmd": [PYTHON, "plot_bridging_effect.py"],
+            "inputs": ["plot_bridging_effect.py", "pareto_results_analyzed.csv"],
+            "outputs": ["thesis_plots/Fig4_Bridging_Tradeoff.png", "thesis_plots/Fig5_Bridging_Panel.png"],
+        },
+        "trade_offs": {
+            "cmd": [PYTHON, "analysis/verify_trade_offs.py"],
+            "inputs": ["analysis/verify_trade_offs.py", "analysis/streaming_analytics.py",
+                       "results/archive/*_pareto_results_final.csv"],
+            "outputs": ["analysis/trade_off_analysis.png"],
+        },
+        "streaming_analytics": {
+            "cmd": [PYTHON, "analysis/streaming_analytics.py", history, "--ticks", str(config["MAX_TICKS"])],
+            "inputs": ["analysis/streaming_analytics.py", history],
+            "outputs": ["streaming_correlations.csv", "streaming_clusters.csv"],
+        },
+    })
+    if config.get("STATE_DUMP_TICKS"):
+        stages["snapshot_metrics"] = {
+            "cmd": [PYTHON, "snapshot_metrics.py", os.path.dirname(dumps), "-o", "snapshot_metrics.csv"],
+            "inputs": ["snapshot_metrics.py", dumps],
+            "outputs": ["snapshot_metrics.csv"],
+        }
+
+    for stage in stages.values():
+        # output_file() prefixes "./", the analysis scripts do not
+        stage["inputs"] = [os.path.normpath(p) for p in stage["inputs"]]
+        stage["outputs"] = [os.path.normpath(p) for p in stage["outputs"]]
+        stage["logs"] = [os.path.normpath(p) for p in stage.get("logs", [])]
+        stage["deps"] = set()
+    for name, stage in stages.items():
+        for other, upstream in stages.items():
+            if other != name and any(fnmatch.fnmatch(i, o) or fnmatch.fnmatch(o, i)
+                                     for i in stage["inputs"] for o in upstream["outputs"]):
+                stage["deps"].add(other)
+    return stages
+
+
+# --- CONTENT HASHES ---
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def expand(patterns):
+    """Paths matched by the patterns; a plain path is kept even when missing."""
+    return [path for pattern in patterns
+            for path in (sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])]
+
+
+def hash_files(patterns):
+    """sha256 of every file matched by the patterns; a missing file hashes to None."""
+    return {path: file_hash(path) if os.path.isfile(path) else None for path in expand(patterns)}
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {}
+    with open(STATE_FILE, 'r') as f:
+        return json.load(f)
+
+
+def save_state(state):
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def up_to_date(stage, record, inputs):
+    if not record or record["cmd"] != stage["cmd"] or record["inputs"] != inputs:
+        return False
+    outputs = hash_files(stage["outputs"])
+    return None not in outputs.values() and record["outputs"] == outputs
+
+
+# --- EXECUTION ---
+def set_aside_outputs(name, stage):
+    """Moves the outputs and logs of the stage's last run to pipeline_previous/<stage>/."""
+    previous = os.path.join(PREVIOUS_DIR, name)
+    shutil.rmtree(previous, ignore_errors=True)
+    for path in expand(stage["outputs"] + stage["logs"]):
+        if not os.path.isfile(path):
+            continue
+        rel = os.path.relpath(path)
+        if rel.startswith(os.pardir):
+            rel = os.path.abspath(path).lstrip(os.sep)
+        target = os.path.join(previous, rel)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(path, target)
+
+
+def run_stage(name, stage):
+    set_aside_outputs(name, stage)
+    for path in stage["outputs"]:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+    env = {**os.environ, "MPLBACKEND": "Agg"}
+    log_file = os.path.join(LOG_DIR, f"{name}.log")
+    start = time.time()
+    with open(log_file, 'w') as log:
+        code = subprocess.run(stage["cmd"], stdout=log, stderr=subprocess.STDOUT, env=env).returncode
+    return code, time.time() - start
+
+
+def run_pipeline(stages, force=False, skip=()):
+    """Runs every stage once its dependencies are settled; returns the per-stage timings."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    state = load_state()
+    status, timings = {}, []
+    pending, running = list(stages), {}
+
+    def settle(name, result, seconds=0.0):
+        status[name] = result
+        timings.append({"Stage": name, "Status": result, "Seconds": seconds})
+
+    with ThreadPoolExecutor(max_workers=multiprocessing.cpu_count()) as executor:
+        while pending or running:
+            for name in list(pending):
+                stage = stages[name]
+                if any(status.get(d) in ("failed", "blocked") for d in stage["deps"]):
+                    settle(name, "blocked")
+                    print(f"⏭️  {name}: blocked")
+                elif not all(d in status for d in stage["deps"]):
+                    continue
+                elif name in skip:
+                    settle(name, "skipped")
+                    print(f"⏭️  {name}: skipped")
+                else:
+                    inputs = hash_files(stage["inputs"])
+                    if not force and up_to_date(stage, state.get(name), inputs):
+                        settle(name, "cached")
+                        print(f"⏭️  {name}: inputs unchanged")
+                    else:
+                        print(f"▶️  {name}: {' '.join(stage['cmd'])}")
+                        running[executor.submit(run_stage, name, stage)] = (name, inputs)
+                pending.remove(name)
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, inputs = running.pop(future)
+                code, seconds = future.result()
+                if code == 0:
+                    state[name] = {"cmd": stages[name]["cmd"], "inputs": inputs,
+                                   "outputs": hash_files(stages[name]["outputs"]), "seconds": seconds}
+                    settle(name, "ran", seconds)
+                    print(f"✅ {name}: {seconds:.1f}s")
+                else:
+                    state.pop(name, None)
+                    settle(name, "failed", seconds)
+                    print(f"❌ {name} failed (exit {code}), see {os.path.join(LOG_DIR, name + '.log')}")
+                save_state(state)
+    return pd.DataFrame(timings)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    force = "--force" in args
+    args = [a for a in args if a != "--force"]
+    skip = []
+    if "--skip" in args:
+        k = args.index("--skip")
+        skip = args[k + 1:]
+        args = args[:k]
+    if len(args) < 1:
+        print("Usage: python3 pipeline.py nsga2_config_final.json [--force] [--skip stage ...]")
+        sys.exit(1)
+
+    with open(args[0], 'r') as f:
+        config = json.load(f)
+
+    stages = build_stages(args[0], config)
+    unknown = set(skip) - set(stages)
+    if unknown:
+        print(f"❌ Unknown stages: {', '.join(sorted(unknown))} (stages: {', '.join(stages)})")
+        sys.exit(1)
+
+    print(f"--- Pipeline: {len(stages)} stages (CPUs: {multiprocessing.cpu_count()}) ---")
+    start = time.time()
+    timings = run_pipeline(stages, force, skip)
+    timings.to_csv(TIMINGS_FILE, index=False)
+
+    print("\n⏱️  Stage timings")
+    print(timings.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+    print(f"\nTotal: {time.time() - start:.1f}s, saved {TIMINGS_FILE}")
+    if (timings["Status"].isin(["failed", "blocked"])).any():
+        sys.exit(1)
@@ -72,11 +72,11 @@ if [[ "$OSTYPE" == "darwin"* ]]; then
     fi
 fi
 
-# Run Optimization
+# Run Optimization and Analysis (stages with unchanged inputs are skipped)
 echo ""
-echo -e "${BLUE}🧠 Launching NSGA-II Optimization...${NC}"
+echo -e "${BLUE}🧠 Launching NSGA-II Optimization and Analysis Pipeline...${NC}"
 echo -e "${BLUE}═══════════════════════════════════════════════${NC}"
-python3 nsga2_optimization.py nsga2_config_final.json
+python3 pipeline.py nsga2_config_final.json "$@"
 
 # Cleanup
 deactivate
@@ -84,9 +84,12 @@ deactivate
 # Summary
 echo ""
 echo -e "${BLUE}═══════════════════════════════════════════════${NC}"
-echo -e "${GREEN}✅ Optimization Complete!${NC}"
+echo -e "${GREEN}✅ Pipeline Complete!${NC}"
 echo ""
 echo -e "📊 Results saved:"
 echo -e "   → pareto_results_final.csv"
+echo -e "   → knee_point_solution.csv, pareto_results_analyzed.csv"
+echo -e "   → thesis_plots/, Fig1/Fig2 figures, analysis/trade_off_analysis.png"
+echo -e "   → pipeline_timings.csv (per-stage timings), pipeline_logs/"
 echo ""
 echo -e "${BLUE}═══════════════════════════════════════════════${NC}"
@@ -0,0 +1,15 @@
+import os
+
+# Locations of a run's output files. Kept apart from the optimizer, so the
+# pipeline can find them without importing pymoo and the NetLogo helpers.
+
+
+def output_file(config, filename):
+    """Path of a run output under OUTPUT_DIR, without creating the directory."""
+    return os.path.join(config.get("OUTPUT_DIR", "."), filename)
+
+
+def output_path(config, filename):
+    """Places a run output under OUTPUT_DIR, so several campaigns can share a working directory."""
+    os.makedirs(config.get("OUTPUT_DIR", "."), exist_ok=True)
+    return output_file(config, filename)
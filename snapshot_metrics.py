@@ -0,0 +1,248 @@
+import csv
+import glob
+import os
+import sys
+import multiprocessing
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+# Offline versions of the model's state-only indicators, computed from the
+# agent-state dumps (one compressed .npz per run and tick) instead of inside
+# the tick loop. Names follow the model's reporters; the column names of the
+# batch table follow summary_metrics.csv.
+#
+# Usage: python3 snapshot_metrics.py <dump dir or .npz files ...> [-o snapshot_metrics.csv]
+
+OUTPUT_FILE = "snapshot_metrics.csv"
+SEGREGATION_RADIUS = 3
+
+# dump-agent-state line name -> npz key, dtype
+DUMP_ARRAYS = {
+    "world": ("world", int),
+    "max-cultures": ("max_cultures", int),
+    "knowledge-spillover-radius": ("spillover_radius", float),
+    "patch-x": ("patch_x", int),
+    "patch-y": ("patch_y", int),
+    "housing-cost": ("housing_cost", float),
+    "household-who": ("household_who", int),
+    "household-x": ("household_x", float),
+    "household-y": ("household_y", float),
+    "household-identity": ("household_identity", int),
+    "household-income": ("household_income", float),
+    "firm-who": ("firm_who", int),
+    "firm-x": ("firm_x", float),
+    "firm-y": ("firm_y", float),
+    "firm-output": ("firm_output", float),
+    "social-links": ("social_links", int),
+    "economic-links": ("economic_links", int),
+}
+
+
+# --- STORAGE ---
+def save_state(path, state):
+    np.savez_compressed(path, **state)
+    return path
+
+
+def load_state(path):
+    with np.load(path) as data:
+        state = {k: data[k] for k in data.files}
+    for key in ["tick", "seed", "max_cultures", "spillover_radius"]:
+        state[key] = state[key].item()
+    return state
+
+
+def state_meta(params, seed):
+    """Run identification stored with every snapshot."""
+    return {"seed": seed, "param_names": np.array(list(params.keys())),
+            "param_values": np.array([float(v) for v in params.values()])}
+
+
+def convert_state_dump(dump_path, meta, remove=True):
+    """Splits a NetLogo state dump into one .npz per tick (state_<tag>_t<tick>.npz)."""
+    by_tick = defaultdict(dict)
+    with open(dump_path, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) >= 2:
+                by_tick[int(float(row[0]))][row[1]] = row[2:]
+
+    base = os.path.splitext(dump_path)[0]
+    static, paths = {}, []
+    for tick in sorted(by_tick):
+        state = {"tick": tick, **meta}
+        for name, values in by_tick[tick].items():
+            key, dtype = DUMP_ARRAYS[name]
+            state[key] = np.array([float(v) for v in values]).astype(dtype)
+        for key in ["world", "max_cultures", "spillover_radius", "patch_x", "patch_y", "housing_cost"]:
+            static.setdefault(key, state.get(key))
+            state[key] = static[key]
+        state["max_cultures"] = int(state["max_cultures"][0])
+        state["spillover_radius"] = float(state["spillover_radius"][0])
+        # who pairs -> positions in the household and firm arrays
+        state["social_links"] = np.searchsorted(state["household_who"], state["social_links"]).reshape(-1, 2)
+        state["economic_links"] = np.searchsorted(state["firm_who"], state["economic_links"]).reshape(-1, 2)
+        paths.append(save_state(f"{base}_t{tick}.npz", state))
+    if remove:
+        os.remove(dump_path)
+    return paths
+
+
+# --- GEOMETRY (wrapping world) ---
+def world_box(state):
+    min_px, max_px, min_py, max_py = state["world"]
+    return np.array([min_px - 0.5, min_py - 0.5]), np.array([max_px - min_px + 1, max_py - min_py + 1])
+
+
+def radius_pairs(state, ax, ay, bx, by, radius):
+    """Index pairs (i, j) with b_j in-radius of a_i, on a periodic cKDTree."""
+    origin, box = world_box(state)
+    a = np.mod(np.column_stack([ax, ay]) - origin, box)
+    b = np.mod(np.column_stack([bx, by]) - origin, box)
+    if len(a) == 0 or len(b) == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    neighbours = cKDTree(a, boxsize=box).query_ball_tree(cKDTree(b, boxsize=box), radius)
+    i = np.repeat(np.arange(len(a)), [len(n) for n in neighbours])
+    j = np.fromiter((k for n in neighbours for k in n), dtype=int, count=len(i))
+    return i, j
+
+
+def patch_of(state, x, y):
+    """Index into the patch arrays of the patch under each point."""
+    origin, box = world_box(state)
+    col = np.mod(np.floor(x - origin[0]).astype(int), int(box[0]))
+    row = np.mod(np.floor(y - origin[1]).astype(int), int(box[1]))
+    lookup = np.empty(int(box[0] * box[1]), dtype=int)
+    lookup[(state["patch_y"] - state["world"][2]) * int(box[0]) + (state["patch_x"] - state["world"][0])] = \
+        np.arange(len(state["patch_x"]))
+    return lookup[row * int(box[0]) + col]
+
+
+# --- INDICATORS ---
+def pearson_r(xs, ys):
+    """pearson-r along the last axis, so a stack of samples is one call; 0 when undefined."""
+    xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    if xs.shape != ys.shape or xs.shape[-1] == 0:
+        return 0.0
+    dx = xs - xs.mean(axis=-1, keepdims=True)
+    dy = ys - ys.mean(axis=-1, keepdims=True)
+    num = (dx * dy).sum(axis=-1)
+    den = np.sqrt((dx * dx).sum(axis=-1)) * np.sqrt((dy * dy).sum(axis=-1))
+    return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+
+def cultural_segregation_index(state):
+    """Mean over patches with more than one household in radius 3 of 1 - Simpson diversity."""
+    i, j = radius_pairs(state, state["patch_x"], state["patch_y"],
+                        state["household_x"], state["household_y"], SEGREGATION_RADIUS)
+    k = max(state["max_cultures"], int(state["household_identity"].max(initial=0)) + 1)
+    counts = np.bincount(i * k + state["household_identity"][j], minlength=len(state["patch_x"]) * k)
+    counts = counts.reshape(-1, k).astype(float)
+    n = counts.sum(axis=1)
+    mixed = n > 1
+    if not mixed.any():
+        return 0.0
+    p = counts[mixed] / n[mixed, None]
+    return float((p * p).sum(axis=1).mean())
+
+
+def spatial_moran_i(state):
+    """Moran's I of firm output with other firms within knowledge-spillover-radius as neighbours."""
+    out = state["firm_output"]
+    n = len(out)
+    if n < 2:
+        return 0.0
+    d = out - out.mean()
+    denom = (d * d).sum()
+    if denom == 0:
+        return 0.0
+    i, j = radius_pairs(state, state["firm_x"], state["firm_y"], state["firm_x"], state["firm_y"],
+                        state["spillover_radius"])
+    other = i != j
+    s0 = other.sum()
+    if s0 == 0:
+        return 0.0
+    return float((n / s0) * ((d[i[other]] * d[j[other]]).sum() / denom))
+
+
+def household_patch_counts(state):
+    k = max(state["max_cultures"], int(state["household_identity"].max(initial=0)) + 1)
+    patch = patch_of(state, state["household_x"], state["household_y"])
+    counts = np.bincount(patch * k + state["household_identity"], minlength=len(state["patch_x"]) * k)
+    return patch, counts.reshape(-1, k).astype(float)
+
+
+def calculate_cultural_mixing(state):
+    """Mean Shannon entropy of the identities on patches with more than one household."""
+    _, counts = household_patch_counts(state)
+    n = counts.sum(axis=1)
+    mixed = n > 1
+    if not mixed.any():
+        return 0.0
+    p = counts[mixed] / n[mixed, None]
+    logs = np.log(np.where(p > 0, p, 1.0))
+    return float((-(p * logs).sum(axis=1)).mean())
+
+
+def gentrification_index_of(state):
+    """Pearson r of housing cost and mean household income over occupied patches."""
+    patch, counts = household_patch_counts(state)
+    n = counts.sum(axis=1)
+    occupied = n > 0
+    if occupied.sum() < 3:
+        return 0.0
+    income = np.bincount(patch, weights=state["household_income"], minlength=len(n))
+    return float(pearson_r(state["housing_cost"][occupied], income[occupied] / n[occupied]))
+
+
+def cross_cultural_link_share_of(state):
+    links = state["social_links"]
+    if len(links) == 0:
+        return 0.0
+    ids = state["household_identity"]
+    return float((ids[links[:, 0]] != ids[links[:, 1]]).mean())
+
+
+def snapshot_metrics(path):
+    """One batch-table row: run identification and every offline indicator of a snapshot."""
+    state = load_state(path)
+    row = {"file": os.path.basename(path), "seed": state["seed"], "tick": state["tick"]}
+    row.update(zip(state["param_names"].tolist(), state["param_values"].tolist()))
+    row.update({
+        "segregation": cultural_segregation_index(state),
+        "spatial_autocorr": spatial_moran_i(state),
+        "cultural_mixing": calculate_cultural_mixing(state),
+        "cross_cultural_link_share": cross_cultural_link_share_of(state),
+        "gentrification_index": gentrification_index_of(state),
+    })
+    return row
+
+
+def batch_metrics(paths, processes=None):
+    """Indicators of many snapshots, one row each, computed on a process pool."""
+    with multiprocessing.Pool(processes or multiprocessing.cpu_count()) as pool:
+        rows = pool.map(snapshot_metrics, paths, chunksize=16)
+    return pd.DataFrame(rows).sort_values(["seed", "tick"]).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    output = OUTPUT_FILE
+    if "-o" in args:
+        k = args.index("-o")
+        output = args[k + 1]
+        args = args[:k] + args[k + 2:]
+    if not args:
+        print("Usage: python3 snapshot_metrics.py <dump dir or .npz files ...> [-o snapshot_metrics.csv]")
+        sys.exit(1)
+
+    paths = []
+    for arg in args:
+        paths += sorted(glob.glob(os.path.join(arg, "*.npz"))) if os.path.isdir(arg) else [arg]
+    print(f"📊 Computing offline metrics for {len(paths)} snapshots...")
+    start = pd.Timestamp.now()
+    df = batch_metrics(paths)
+    df.to_csv(output, index=False)
+    print(f"✅ Saved {output} ({len(df)} rows, {(pd.Timestamp.now() - start).total_seconds():.1f}s)")